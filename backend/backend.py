@@ -1,5 +1,6 @@
 from flask import (
     Flask,
+    Request,
     render_template,
     request,
     jsonify,
@@ -10,10 +11,27 @@ from flask import (
     url_for,
 )
 from flask_cors import CORS
+from flask_caching import Cache
+from flask_session import Session
+import redis
 import mysql.connector
-from werkzeug.security import generate_password_hash, check_password_hash
+from mysql.connector import errorcode, pooling
+from mysql.connector.constants import ClientFlag
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from PIL import Image, ImageOps
+from whitenoise import WhiteNoise
 from dotenv import load_dotenv
+import logging
 import os
+import secrets
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from functools import wraps
 from werkzeug.utils import secure_filename
 
@@ -25,6 +43,10 @@ DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_USER = os.getenv("DB_USER", "root")
 DB_PASS = os.getenv("DB_PASS", "root")
 DB_NAME = os.getenv("DB_NAME", "petcare")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+# Seconds a request waits for a pooled connection before giving up
+DB_POOL_WAIT = 5
+REDIS_URL = os.getenv("REDIS_URL")
 
 # app = Flask(_name_, template_folder=template_dir)
 # CORS(app)
@@ -38,42 +60,300 @@ static_dir = os.path.join(BASE_DIR, "..", "frontend", "assets")
 template_dir = os.path.normpath(template_dir)
 static_dir = os.path.normpath(static_dir)
 
-print("Looking for templates in:", template_dir)
 app = Flask(
     __name__,
     template_folder=template_dir,
     static_folder=static_dir,
     static_url_path="/assets",
 )
+app.logger.debug("Looking for templates in: %s", template_dir)
+
+# Required for flash and session; must be identical across workers so cookies stay valid.
+# No fallback: a missing key stops startup instead of signing sessions with a known value
+app.secret_key = os.environ["SECRET_KEY"]
+
+# Shared Redis cache when REDIS_URL is configured. Without it caching is off: a per-process
+# cache would only be invalidated in the worker that handled the write, and Gunicorn
+# forks several workers.
+cache = Cache(
+    app,
+    config={
+        "CACHE_TYPE": "RedisCache" if REDIS_URL else "NullCache",
+        "CACHE_NO_NULL_WARNING": True,
+        "CACHE_REDIS_URL": REDIS_URL,
+    },
+)
+ADMIN_DASHBOARD_CACHE_KEY = "dashboard:admin:v1"
+ADMIN_PETS_CACHE_KEY = "managepets:admin:v1"
+ALL_VACCINATIONS_CACHE_KEY = "vaccinations:all:v1"
+ALL_MEDICATIONS_CACHE_KEY = "medications:all:v1"
+# Formatted with the vet_id, so one vet's list is never served to another
+VET_VACCINATIONS_CACHE_KEY = "vaccinations:vet:{}:v1"
+VET_MEDICATIONS_CACHE_KEY = "medications:vet:{}:v1"
+# Formatted with the role and the lowercased query (LIKE is case-insensitive here)
+AUTOCOMPLETE_CACHE_KEY = "autocomplete:{}:{}:v1"
+ADMIN_APPOINTMENTS_CACHE_KEY = "appointments:admin:v1"
+# Shared lists that show users' full names; dropped whenever a name can change.
+# The per-vet lists and autocomplete are left to their TTLs.
+USER_NAME_CACHE_KEYS = (
+    ADMIN_PETS_CACHE_KEY, ADMIN_DASHBOARD_CACHE_KEY, ADMIN_APPOINTMENTS_CACHE_KEY,
+    ALL_VACCINATIONS_CACHE_KEY, ALL_MEDICATIONS_CACHE_KEY,
+)
 
-app.secret_key = "super_secret_key"  # Required for flash and session
-
-
-UPLOAD_FOLDER = os.path.join(BASE_DIR, '..', 'static', 'uploads')
-UPLOAD_FOLDER = os.path.normpath(UPLOAD_FOLDER)
-ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
+# Keep sessions server-side in Redis so the cookie only carries the session id
+if REDIS_URL:
+    app.config["SESSION_TYPE"] = "redis"
+    app.config["SESSION_REDIS"] = redis.from_url(REDIS_URL)
+    Session(app)
+
+
+STATIC_ROOT = os.path.normpath(os.path.join(BASE_DIR, '..', 'static'))
+UPLOAD_FOLDER = os.path.join(STATIC_ROOT, 'uploads')
+PETS_UPLOAD_FOLDER = os.path.join(UPLOAD_FOLDER, 'pets')
+# argon2id at the OWASP 46 MiB baseline; parameters are explicit so a library upgrade
+# cannot silently change the per-login hashing cost
+password_hasher = PasswordHasher(time_cost=2, memory_cost=46 * 1024, parallelism=1)
+ALLOWED_EXTENSIONS = frozenset({"png", "jpg", "jpeg", "gif"})
+# Values of the appointments.status ENUM
+APPOINTMENT_STATUSES = frozenset({"Pending", "Confirmed", "Completed", "Cancelled"})
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+PET_IMAGE_MAX_SIZE = (800, 800)
 
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
 app.config["MAX_CONTENT_LENGTH"] = 5 * 1024 * 1024  # 5 MB max
 
-# Create upload directory if it doesn't exist
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
+# Create upload directories if they don't exist
+os.makedirs(PETS_UPLOAD_FOLDER, exist_ok=True)
+
+
+class UploadRequest(Request):
+    # Spool every uploaded file straight to disk next to its final home instead of
+    # keeping small ones in memory; leftovers are removed when the request closes.
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        stream = tempfile.NamedTemporaryFile("wb+", dir=UPLOAD_FOLDER, prefix=".upload-", delete=False)
+        self._spooled_uploads = getattr(self, "_spooled_uploads", []) + [stream.name]
+        return stream
+
+    def close(self):
+        super().close()
+        for path in getattr(self, "_spooled_uploads", ()):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+app.request_class = UploadRequest
+
+
+def move_upload(file, dest):
+    # The part is already spooled inside UPLOAD_FOLDER, so a rename puts it in place without copying
+    file.stream.flush()
+    os.replace(file.stream.name, dest)
+    os.chmod(dest, 0o644)
+
+
+# Threads start on first submit, so forked workers each get their own
+image_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pet-images")
+# Runs independent list queries side by side, each on its own pooled connection;
+# gunicorn.conf.py adds these threads to the pool size
+query_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="list-queries")
+
+
+def shrink_pet_image(path):
+    # Runs off the request path. The original is already served from path until the
+    # web-sized copy replaces it atomically.
+    try:
+        with Image.open(path) as img:
+            fmt = img.format
+            if fmt == "GIF" or (img.width <= PET_IMAGE_MAX_SIZE[0] and img.height <= PET_IMAGE_MAX_SIZE[1]):
+                return
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail(PET_IMAGE_MAX_SIZE)
+            tmp = path + ".resized"
+            img.save(tmp, format=fmt)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except Exception:
+        app.logger.exception("Could not resize %s", path)
+
+# WhiteNoise answers /assets and /static from an index of stat results, content types and
+# ETags built at startup, without entering Flask. Files written later (new pet photos) are
+# not in that index and fall through to the Flask routes. Asset URLs are not versioned,
+# so browsers revalidate after an hour.
+app.wsgi_app = WhiteNoise(app.wsgi_app, max_age=3600)
+app.wsgi_app.add_files(static_dir, prefix="assets/")
+app.wsgi_app.add_files(STATIC_ROOT, prefix="static/")
 
 # Serve static files from the static directory
 @app.route('/static/<path:filename>')
 def serve_static(filename):
-    static_root = os.path.join(BASE_DIR, '..', 'static')
-    static_root = os.path.normpath(static_root)
-    return send_from_directory(static_root, filename)
+    return send_from_directory(STATIC_ROOT, filename)
+
+_pool = None
+_pool_lock = threading.Lock()
+
 
 def get_conn():
-    return mysql.connector.connect(
-        host=DB_HOST, user=DB_USER, password=DB_PASS, database=DB_NAME
-    )
+    # The pool is built on first use so every worker process gets its own sockets.
+    # close() on a pooled connection hands it back to the pool instead of disconnecting.
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name="petcare",
+                    pool_size=DB_POOL_SIZE,
+                    host=DB_HOST,
+                    user=DB_USER,
+                    password=DB_PASS,
+                    database=DB_NAME,
+                    autocommit=False,
+                    # No COM_RESET_CONNECTION round-trip on release: handlers keep no session state,
+                    # and db_cursor ends any transaction left open before handing the connection back
+                    pool_reset_session=False,
+                    # Streamed result sets abandoned mid-render are drained instead of poisoning the connection
+                    consume_results=True,
+                    # rowcount reports matched rather than changed rows, so an UPDATE that
+                    # rewrites the current value still reads as "found"
+                    client_flags=[ClientFlag.FOUND_ROWS],
+                    # C extension: packet parsing and row decoding happen in libmysqlclient
+                    use_pure=False,
+                )
+    # get_connection() fails at once when every connection is checked out; wait for one
+    # to come back instead, so a burst beyond the pool size queues rather than erroring
+    deadline = time.monotonic() + DB_POOL_WAIT
+    while True:
+        try:
+            return _pool.get_connection()
+        except mysql.connector.PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.01)
+
+
+@contextmanager
+def db_cursor(dictionary=True):
+    conn = get_conn()
+    cursor = conn.cursor(dictionary=dictionary)
+    try:
+        yield conn, cursor
+    finally:
+        try:
+            cursor.close()
+            # Reads under autocommit=False leave a REPEATABLE READ snapshot open; without the
+            # pool's session reset the next request would otherwise see that stale snapshot
+            if conn.in_transaction:
+                conn.rollback()
+        finally:
+            conn.close()
+
+
+def execute_multi(cursor, operation, params=()):
+    # Runs ;-separated statements in one round-trip and drains every result set,
+    # so an error in a later statement is raised here instead of on the next query.
+    # Returns one entry per statement: the rows of a SELECT, the rowcount of anything else.
+    cursor.execute(operation, params)
+    results = []
+    while True:
+        results.append(cursor.fetchall() if cursor.with_rows else cursor.rowcount)
+        if not cursor.nextset():
+            return results
+
+
+def role_insert(role, specialization, phone, address):
+    # Role-specific row for the users row inserted just before it in the same batch
+    if role == "Veterinarian":
+        return (
+            "INSERT INTO veterinarians (user_id, specialization, phone, clinic_address) VALUES (LAST_INSERT_ID(), %s, %s, %s)",
+            (specialization, phone, address),
+        )
+    if role == "Pet Owner":
+        return (
+            "INSERT INTO owners (user_id, phone, address) VALUES (LAST_INSERT_ID(), %s, %s)",
+            (phone, address),
+        )
+    return "", ()
+
+
+def current_owner_id(cursor):
+    # Stored at login; looked up once here for sessions where the owners row was missing then
+    if session.get("owner_id") is None:
+        cursor.execute("SELECT owner_id FROM owners WHERE user_id = %s", (session["user_id"],))
+        row = cursor.fetchone()
+        if row:
+            session["owner_id"] = row["owner_id"]
+    return session.get("owner_id")
+
+
+def current_vet_id(cursor=None):
+    # Without a cursor a connection is only checked out when the session lacks vet_id
+    if session.get("vet_id") is None:
+        if cursor is None:
+            with db_cursor() as (conn, cursor):
+                return current_vet_id(cursor)
+        cursor.execute("SELECT vet_id FROM veterinarians WHERE user_id = %s", (session["user_id"],))
+        row = cursor.fetchone()
+        if row:
+            session["vet_id"] = row["vet_id"]
+    return session.get("vet_id")
+
+
+def cached_rows(key, sql, params=(), timeout=60, row_type=None):
+    # Read-through cache for list queries; writers delete the key after committing.
+    # key=None bypasses the cache. row_type, a module-level namedtuple matching the
+    # SELECT list, is built from plain tuple rows instead of a dict per row.
+    rows = cache.get(key) if key else None
+    if rows is None:
+        with db_cursor(dictionary=row_type is None) as (conn, cursor):
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        if row_type:
+            rows = [row_type._make(row) for row in rows]
+        if key:
+            cache.set(key, rows, timeout=timeout)
+    return rows
+
+
+def page_args():
+    # ?page=N&size=K, clamped so a single request never pulls an unbounded list
+    page = max(request.args.get("page", 1, type=int), 1)
+    size = min(max(request.args.get("size", PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+    return page, size
+
+
+def paged_rows(key, sql, params=(), paging=None, row_type=None, timeout=60):
+    # Fetches one extra row to learn whether a next page exists. Only the default first
+    # page goes through the cache, so writers still invalidate a single key per list.
+    # Worker threads have no request context, so they pass paging in.
+    page, size = paging or page_args()
+    if (page, size) != (1, PAGE_SIZE):
+        key = None
+    rows = cached_rows(key, sql + " LIMIT %s OFFSET %s", tuple(params) + (size + 1, (page - 1) * size), timeout=timeout, row_type=row_type)
+    return rows[:size], len(rows) > size
+
+
+def hash_password(password):
+    return password_hasher.hash(password)
+
+
+def verify_password(stored, password):
+    # Returns (matches, needs_rehash). Rows written before argon2 still hold Werkzeug
+    # scrypt/pbkdf2 hashes; those verify the old way and are flagged for rehashing.
+    if not stored.startswith("$argon2"):
+        return check_password_hash(stored, password), True
+    try:
+        password_hasher.verify(stored, password)
+    except (VerificationError, InvalidHashError):
+        return False, False
+    return True, password_hasher.check_needs_rehash(stored)
+
 
 def allowed_file(filename):
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+    # rpartition returns a tuple without building a list like rsplit does
+    _, dot, ext = filename.rpartition(".")
+    return bool(dot) and ext.lower() in ALLOWED_EXTENSIONS
 
 
 @app.route("/404", methods=["GET"])
@@ -116,47 +396,37 @@ def register():
         flash("Password mismatch.", "danger")
         return render_template("petcareFrontend/register.html")
 
-    conn = get_conn()
-    cur = conn.cursor()
-
-    # cur = conn.cursor(dictionary=True)
-    cur.execute("SELECT * FROM users WHERE email = %s", (email,))
-    user1 = cur.fetchone()
+    error = None
+    with db_cursor(dictionary=False) as (conn, cur):
+        cur.execute("SELECT 1 FROM users WHERE email = %s LIMIT 1", (email,))
+        user1 = cur.fetchone()
 
-    if user1:
-        flash("email duplicate.", "danger")
-        cur.close()
-        conn.close()
-        return render_template("petcareFrontend/register.html")
-    hashed = generate_password_hash(password)
-    try:
-        cur.execute(
-            "INSERT INTO users (full_name, password, email, role) VALUES (%s, %s, %s, %s)",
-            (full_name, hashed, email, role),
-        )
-        
-        # Get the newly inserted user_id
-        user_id = cur.lastrowid
-        roleQuery=""
-        if(role == "Veterinarian"):
-            roleQuery = "INSERT INTO veterinarians (user_id, specialization, phone, clinic_address) VALUES (%s, %s, %s, %s)"
-            values = (user_id, specialization, phone, address)
-        elif(role == "Pet Owner"):
-            roleQuery = "INSERT INTO owners (user_id, phone, address) VALUES (%s, %s, %s)"
-            values = (user_id, phone, address)
-        if(roleQuery):
-            cur.execute(roleQuery, values)
-        conn.commit()
-    except mysql.connector.Error as e:
-        conn.rollback()
-        cur.close()
-        conn.close()
-        print(str(e))
-        flash("Something went wrong.", "danger")
+        if user1:
+            error = "email duplicate."
+        else:
+            hashed = hash_password(password)
+            try:
+                query = "INSERT INTO users (full_name, password, email, role) VALUES (%s, %s, %s, %s)"
+                values = (full_name, hashed, email, role)
+
+                # Send the users row and its role row together
+                roleQuery, roleValues = role_insert(role, specialization, phone, address)
+                if(roleQuery):
+                    query += "; " + roleQuery
+                    values += roleValues
+                execute_multi(cur, query, values)
+                conn.commit()
+                cache.delete(ADMIN_DASHBOARD_CACHE_KEY)
+            except mysql.connector.Error as e:
+                conn.rollback()
+                app.logger.exception("MySQL error in register")
+                error = "Something went wrong."
+
+    # Re-render the form only after the connection is back in the pool
+    if error:
+        flash(error, "danger")
         return render_template("petcareFrontend/register.html")
 
-    cur.close()
-    conn.close()
     flash("Registration successful! Please login.", "success")
     return redirect(url_for("login"))
 
@@ -172,21 +442,38 @@ def login():
         flash("email and password required.", "danger")
         return render_template("petcareFrontend/index.html")
 
-    conn = get_conn()
-    cur = conn.cursor(dictionary=True)
-    cur.execute("SELECT * FROM users WHERE email = %s", (email,))
-    user = cur.fetchone()
-    cur.close()
-    conn.close()
+    # One row, so a tuple cursor unpacked by position; a prepared cursor would add a
+    # prepare and close round-trip on this per-request cursor
+    with db_cursor(dictionary=False) as (conn, cur):
+        cur.execute(
+            """
+            SELECT u.user_id, u.full_name, u.role, u.password, o.owner_id, v.vet_id
+            FROM users u
+            LEFT JOIN owners o ON o.user_id = u.user_id
+            LEFT JOIN veterinarians v ON v.user_id = u.user_id
+            WHERE u.email = %s LIMIT 1
+            """,
+            (email,),
+        )
+        user = cur.fetchone()
 
     if not user:
         flash("Invalid credentials.", "danger")
         return render_template("petcareFrontend/index.html")
 
-    if check_password_hash(user["password"], password):
-        session["user_id"] = user["user_id"]
-        session["full_name"] = user["full_name"]
-        session["role"] = user["role"]
+    user_id, full_name, role, password_hash, owner_id, vet_id = user
+    matches, needs_rehash = verify_password(password_hash, password)
+    if matches:
+        if needs_rehash:
+            # Upgrade the stored hash while the plaintext is at hand
+            with db_cursor() as (conn, cur):
+                cur.execute("UPDATE users SET password = %s WHERE user_id = %s", (hash_password(password), user_id))
+                conn.commit()
+        session["user_id"] = user_id
+        session["full_name"] = full_name
+        session["role"] = role
+        session["owner_id"] = owner_id
+        session["vet_id"] = vet_id
         # NOTE: we return user_id and role for simple session handling on frontend (no JWT here yet)
         return redirect(url_for("homePage"))
     else:
@@ -213,318 +500,270 @@ def logout():
     return redirect(url_for("login"))
 
 
-@app.route("/", methods=["GET"])
-@role_required("Admin","Pet Owner","Veterinarian")
-def homePage():
-    if "user_id" not in session:
-        return redirect(url_for("login"))
+def _admin_dashboard_data():
+    # Counters and recent activity move slowly, so serve them from the cache for a minute
+    payload = cache.get(ADMIN_DASHBOARD_CACHE_KEY)
+    if payload is not None:
+        return payload
+
+    # Counters and recent activities in one round-trip; a prepared cursor cannot carry a
+    # multi-statement batch, and would cost a prepare per query on this per-request cursor
+    with db_cursor() as (conn, cursor):
+        (stats,), recent_activities = execute_multi(cursor, """
+            SELECT
+                (SELECT COUNT(*) FROM users WHERE vchr_status = 'A') AS total_users,
+                (SELECT COUNT(*) FROM pets) AS total_pets,
+                (SELECT COUNT(*) FROM appointments WHERE appointment_date >= CURDATE()) AS total_appointments,
+                (SELECT COUNT(*) FROM vaccinations) + (SELECT COUNT(*) FROM medications) AS total_records;
+            (SELECT 'User Registration' as activity_type, CONCAT('New user: ', u.full_name) as details, u.created_at as activity_date
+             FROM users u WHERE u.vchr_status = 'A' ORDER BY u.created_at DESC LIMIT 3)
+            UNION ALL
+            (SELECT 'Pet Added' as activity_type, CONCAT('New pet: ', p.name, ' (', p.breed, ')') as details, p.created_at as activity_date
+             FROM pets p ORDER BY p.created_at DESC LIMIT 3)
+            UNION ALL
+            (SELECT 'Appointment' as activity_type, CONCAT('Appointment booked for ', p.name) as details, a.created_at as activity_date
+             FROM appointments a JOIN pets p ON a.pet_id = p.pet_id ORDER BY a.created_at DESC LIMIT 3)
+            ORDER BY activity_date DESC LIMIT 10
+        """)
 
-    # Role-based dashboard rendering
-    role = session.get("role")
-    user_id = session.get("user_id")
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        if role == "Admin":
-            # Get dashboard statistics
-            cursor.execute("SELECT COUNT(*) as total_users FROM users WHERE vchr_status = 'A'")
-            total_users = cursor.fetchone()["total_users"]
-            
-            cursor.execute("SELECT COUNT(*) as total_pets FROM pets")
-            total_pets = cursor.fetchone()["total_pets"]
-            
-            cursor.execute("SELECT COUNT(*) as total_appointments FROM appointments WHERE DATE(appointment_date) >= CURDATE()")
-            total_appointments = cursor.fetchone()["total_appointments"]
-            
-            cursor.execute("SELECT COUNT(*) as total_records FROM (SELECT vaccination_id FROM vaccinations UNION ALL SELECT medication_id FROM medications) as records")
-            total_records = cursor.fetchone()["total_records"]
-            
-            # Get recent activities
-            cursor.execute("""
-                (SELECT 'User Registration' as activity_type, CONCAT('New user: ', u.full_name) as details, u.created_at as activity_date
-                 FROM users u WHERE u.vchr_status = 'A' ORDER BY u.created_at DESC LIMIT 3)
-                UNION ALL
-                (SELECT 'Pet Added' as activity_type, CONCAT('New pet: ', p.name, ' (', p.breed, ')') as details, p.created_at as activity_date
-                 FROM pets p ORDER BY p.created_at DESC LIMIT 3)
-                UNION ALL
-                (SELECT 'Appointment' as activity_type, CONCAT('Appointment booked for ', p.name) as details, a.created_at as activity_date
-                 FROM appointments a JOIN pets p ON a.pet_id = p.pet_id ORDER BY a.created_at DESC LIMIT 3)
-                ORDER BY activity_date DESC LIMIT 10
-            """)
-            recent_activities = cursor.fetchall()
-            
-            return render_template("dashboard/admin.html", 
-                                 total_users=total_users, 
-                                 total_pets=total_pets, 
-                                 total_appointments=total_appointments, 
-                                 total_records=total_records,
-                                 recent_activities=recent_activities)
-        elif role == "Veterinarian":
-            # Get vet_id and today's appointments
-            cursor.execute("SELECT vet_id FROM veterinarians WHERE user_id = %s", (user_id,))
-            vet_data = cursor.fetchone()
-            
-            today_appointments = []
-            if vet_data:
-                cursor.execute("""
-                    SELECT a.*, p.name as pet_name, u.full_name as owner_name,
-                           TIME_FORMAT(a.appointment_date, '%h:%i %p') as appointment_time
-                    FROM appointments a
-                    JOIN pets p ON a.pet_id = p.pet_id
-                    JOIN owners o ON a.owner_id = o.owner_id
-                    JOIN users u ON o.user_id = u.user_id
-                    WHERE a.vet_id = %s AND DATE(a.appointment_date) = CURDATE()
-                    AND a.status != 'Cancelled'
-                    ORDER BY a.appointment_date ASC
-                """, (vet_data["vet_id"],))
-                today_appointments = cursor.fetchall()
-            
-            # Get recent activities (last 10)
-            recent_activities = []
-            if vet_data:
-                cursor.execute("""
-                    (SELECT 'Vaccination' as activity_type, v.vaccine_name as details, 
-                     p.name as pet_name, v.date_given as activity_date
-                     FROM vaccinations v
-                     JOIN pets p ON v.pet_id = p.pet_id
-                     WHERE v.vet_id = %s)
-                    UNION ALL
-                    (SELECT 'Medication' as activity_type, m.medicine_name as details,
-                     p.name as pet_name, m.start_date as activity_date
-                     FROM medications m
-                     JOIN pets p ON m.pet_id = p.pet_id
-                     WHERE m.vet_id = %s)
-                    ORDER BY activity_date DESC
-                    LIMIT 10
-                """, (vet_data["vet_id"], vet_data["vet_id"]))
-                recent_activities = cursor.fetchall()
-            
-            return render_template("dashboard/vet.html", today_appointments=today_appointments, recent_activities=recent_activities)
-        cursor.execute(
-            """
-                SELECT pt.*
-                FROM pets pt
-                LEFT JOIN owners owr ON pt.owner_id = owr.owner_id
-                WHERE owr.user_id = %s
-            """,(user_id,)
-        )
-        pets = cursor.fetchall()
-        
-        # Get upcoming reminders (medications and vaccinations)
-        cursor.execute(
-            """
+    payload = {**stats, "recent_activities": recent_activities}
+    cache.set(ADMIN_DASHBOARD_CACHE_KEY, payload, timeout=60)
+    return payload
+
+
+def _home_admin(user_id):
+    return render_template("dashboard/admin.html", **_admin_dashboard_data())
+
+
+def _home_vet(user_id):
+    # Today's appointments and recent activities (last 10) in one round-trip,
+    # resolving vet_id inline instead of with a separate lookup
+    with db_cursor() as (conn, cursor):
+        today_appointments, recent_activities = execute_multi(cursor, """
+            SELECT a.*, p.name as pet_name, u.full_name as owner_name,
+                   TIME_FORMAT(a.appointment_date, '%h:%i %p') as appointment_time
+            FROM appointments a
+            JOIN pets p ON a.pet_id = p.pet_id
+            JOIN owners o ON a.owner_id = o.owner_id
+            JOIN users u ON o.user_id = u.user_id
+            WHERE a.vet_id = (SELECT vet_id FROM veterinarians WHERE user_id = %s)
+            AND a.appointment_date >= CURDATE() AND a.appointment_date < CURDATE() + INTERVAL 1 DAY
+            AND a.status != 'Cancelled'
+            ORDER BY a.appointment_date ASC;
+
+            (SELECT 'Vaccination' as activity_type, v.vaccine_name as details, 
+             p.name as pet_name, v.date_given as activity_date
+             FROM vaccinations v
+             JOIN pets p ON v.pet_id = p.pet_id
+             WHERE v.vet_id = (SELECT vet_id FROM veterinarians WHERE user_id = %s))
+            UNION ALL
+            (SELECT 'Medication' as activity_type, m.medicine_name as details,
+             p.name as pet_name, m.start_date as activity_date
+             FROM medications m
+             JOIN pets p ON m.pet_id = p.pet_id
+             WHERE m.vet_id = (SELECT vet_id FROM veterinarians WHERE user_id = %s))
+            ORDER BY activity_date DESC
+            LIMIT 10
+        """, (user_id, user_id, user_id))
+
+    return render_template("dashboard/vet.html", today_appointments=today_appointments, recent_activities=recent_activities)
+
+
+def _home_owner(user_id):
+    with db_cursor() as (conn, cursor):
+        # With owner_id from the session every branch filters pets.owner_id (idx_pets_owner)
+        # and reaches medications/vaccinations through their pet_id indexes, with no owners join.
+        # Pets and upcoming reminders go to the server in one batch.
+        owner_id = current_owner_id(cursor)
+        pets, upcoming_reminders = execute_multi(cursor, """
+            SELECT pt.pet_id, pt.name, pt.breed, pt.age, pt.image
+            FROM pets pt
+            WHERE pt.owner_id = %s;
             (SELECT 'Medication' as reminder_type, m.medicine_name as details,
              p.name as pet_name, m.end_date as reminder_date
              FROM medications m
              JOIN pets p ON m.pet_id = p.pet_id
-             JOIN owners o ON p.owner_id = o.owner_id
-             WHERE o.user_id = %s AND m.end_date >= CURDATE())
+             WHERE p.owner_id = %s AND m.end_date >= CURDATE())
             UNION ALL
             (SELECT 'Vaccination' as reminder_type, v.vaccine_name as details,
              p.name as pet_name, DATE_ADD(v.date_given, INTERVAL 365 DAY) as reminder_date
              FROM vaccinations v
              JOIN pets p ON v.pet_id = p.pet_id
-             JOIN owners o ON p.owner_id = o.owner_id
-             WHERE o.user_id = %s AND DATE_ADD(v.date_given, INTERVAL 365 DAY) >= CURDATE())
+             WHERE p.owner_id = %s AND v.date_given >= CURDATE() - INTERVAL 365 DAY)
             ORDER BY reminder_date ASC
             LIMIT 5
-            """, (user_id, user_id)
-        )
-        upcoming_reminders = cursor.fetchall()
-        
-        return render_template("dashboard/owner.html", pets=pets, upcoming_reminders=upcoming_reminders)
-    finally:
-        cursor.close()
-        conn.close()
+        """, (owner_id, owner_id, owner_id))
+
+    return render_template("dashboard/owner.html", pets=pets, upcoming_reminders=upcoming_reminders)
+
+
+HOME_VIEWS = {
+    "Admin": _home_admin,
+    "Veterinarian": _home_vet,
+    "Pet Owner": _home_owner,
+}
+
+
+@app.route("/", methods=["GET"])
+@role_required("Admin","Pet Owner","Veterinarian")
+def homePage():
+    # Role-based dashboard rendering
+    return HOME_VIEWS[session["role"]](session["user_id"])
 
 @app.route("/manageusers", methods=["GET", "POST"])
 @role_required("Admin")
 def manage_users():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    users = []
-    try:
-        # Fetch all users (whether GET or POST)
-        cursor.execute(
-            """
-            SELECT 
-            usr.user_id AS user_id,
-            usr.full_name AS full_name,
-            COALESCE(owr.owner_id, vet.vet_id) AS related_id,
-            usr.email AS email,
-            usr.role AS role,
-            usr.status AS status,
-            vet.specialization AS specialization,
-            CASE 
-                WHEN usr.role = 'Pet Owner' THEN owr.phone
-                WHEN usr.role = 'Veterinarian' THEN vet.phone
-                ELSE NULL
-            END AS phone,
-            CASE 
-                WHEN usr.role = 'Pet Owner' THEN owr.address
-                WHEN usr.role = 'Veterinarian' THEN vet.clinic_address
-                ELSE NULL
-            END AS address
-            FROM users AS usr
-            LEFT JOIN owners AS owr ON usr.user_id = owr.user_id
-            LEFT JOIN veterinarians AS vet ON usr.user_id = vet.user_id
-            WHERE usr.vchr_status = 'A'
-            """
-        )
-        users = cursor.fetchall()
-
-    except mysql.connector.Error as e:
-        conn.rollback()
-        cur.close()
-        conn.close()
-        print(str(e))
+    with db_cursor() as (conn, cursor):
+        try:
+            # Fetch all users (whether GET or POST)
+            cursor.execute(
+                """
+                SELECT 
+                usr.user_id AS user_id,
+                usr.full_name AS full_name,
+                COALESCE(owr.owner_id, vet.vet_id) AS related_id,
+                usr.email AS email,
+                usr.role AS role,
+                usr.status AS status,
+                vet.specialization AS specialization,
+                CASE 
+                    WHEN usr.role = 'Pet Owner' THEN owr.phone
+                    WHEN usr.role = 'Veterinarian' THEN vet.phone
+                    ELSE NULL
+                END AS phone,
+                CASE 
+                    WHEN usr.role = 'Pet Owner' THEN owr.address
+                    WHEN usr.role = 'Veterinarian' THEN vet.clinic_address
+                    ELSE NULL
+                END AS address
+                FROM users AS usr
+                LEFT JOIN owners AS owr ON usr.user_id = owr.user_id
+                LEFT JOIN veterinarians AS vet ON usr.user_id = vet.user_id
+                WHERE usr.vchr_status = 'A'
+                """
+            )
+        except mysql.connector.Error as e:
+            conn.rollback()
+            app.logger.exception("MySQL error in manage_users")
+            return render_template("dashboard/admin_dashboard/manageusers.html", users=[])
 
-    finally:
-        cursor.close()
-        conn.close()
-    return render_template("dashboard/admin_dashboard/manageusers.html", users=users)
+        # Stream rows from the unbuffered cursor while the template renders
+        # instead of materializing the whole user list first
+        return render_template("dashboard/admin_dashboard/manageusers.html", users=cursor)
 
 
 @app.route("/manage_add_user", methods=["POST"])
 @role_required("Admin")
 def manage_add_users():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        # Handle form submission (Add new user)
-        full_name = request.form["full_name"]
-        email = request.form["email"]
-        role = request.form["role"]
-        status = request.form["status"]
-        phone = request.form["phone"]
-        specialization = request.form["specialization"]
-        address = request.form["address"]
-        password = request.form["password"]
-        password = generate_password_hash(password)
-        query = "INSERT INTO users (full_name, email, role, status,password) VALUES (%s, %s, %s, %s, %s)"
-        values = (full_name, email, role, status, password)
-        cursor.execute(query, values)
-        
-        # Get the newly inserted user_id
-        user_id = cursor.lastrowid
-        roleQuery=""
-        if(role == "Veterinarian"):
-            roleQuery = "INSERT INTO veterinarians (user_id, specialization, phone, clinic_address) VALUES (%s, %s, %s, %s)"
-            values = (user_id, specialization, phone, address)
-        elif(role == "Pet Owner"):
-            roleQuery = "INSERT INTO owners (user_id, phone, address) VALUES (%s, %s, %s)"
-            values = (user_id, phone, address)
-        if(roleQuery):
-            cursor.execute(roleQuery, values)
-        flash("New " + role + " has been added", "success")
-        conn.commit()
-    except mysql.connector.Error as e:
-        conn.rollback()
-        flash("Something went wrong", "danger")
-    finally:
-        cursor.close()
-        conn.close()
+    with db_cursor() as (conn, cursor):
+        try:
+            # Handle form submission (Add new user)
+            full_name = request.form["full_name"]
+            email = request.form["email"]
+            role = request.form["role"]
+            status = request.form["status"]
+            phone = request.form["phone"]
+            specialization = request.form["specialization"]
+            address = request.form["address"]
+            password = request.form["password"]
+            password = hash_password(password)
+            query = "INSERT INTO users (full_name, email, role, status,password) VALUES (%s, %s, %s, %s, %s)"
+            values = (full_name, email, role, status, password)
+
+            # Send the users row and its role row together
+            roleQuery, roleValues = role_insert(role, specialization, phone, address)
+            if(roleQuery):
+                query += "; " + roleQuery
+                values += roleValues
+            execute_multi(cursor, query, values)
+            flash("New " + role + " has been added", "success")
+            conn.commit()
+            cache.delete(ADMIN_DASHBOARD_CACHE_KEY)
+        except mysql.connector.Error as e:
+            conn.rollback()
+            flash("Something went wrong", "danger")
     return redirect(url_for("manage_users"))
 
 
 @app.route("/manage_edit_user", methods=["POST"])
 @role_required("Admin")
 def manage_edit_users():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        # Get form data
-        user_id = request.form["user_id"]
-        full_name = request.form["full_name"]
-        role = request.form["role"]
-        status = request.form["status"]
-        phone = request.form.get("phone")
-        specialization = request.form.get("specialization")
-        address = request.form.get("address")
-        password = request.form.get("password")
-
-        # --- Update users table ---
-        query = "UPDATE users SET full_name = %s, role = %s, status = %s"
-        values = [full_name, role, status]
-
-        if password:  # optional password update
-            query += ", password = %s"
-            values.append(generate_password_hash(password))
-
-        query += " WHERE user_id = %s"
-        values.append(user_id)
-
-        cursor.execute(query, tuple(values))
-
-        # --- Update role-specific table ---
-        if role == "Veterinarian":
-            # Check if entry exists
-            cursor.execute("SELECT * FROM veterinarians WHERE user_id = %s", (user_id,))
-            vet = cursor.fetchone()
-            if vet:
-                # Update existing
-                cursor.execute(
-                    "UPDATE veterinarians SET specialization = %s, phone = %s, clinic_address = %s WHERE user_id = %s",
-                    (specialization, phone, address, user_id)
-                )
-            else:
-                # Insert new
+    with db_cursor() as (conn, cursor):
+        try:
+            # Get form data
+            user_id = request.form["user_id"]
+            full_name = request.form["full_name"]
+            role = request.form["role"]
+            status = request.form["status"]
+            phone = request.form.get("phone")
+            specialization = request.form.get("specialization")
+            address = request.form.get("address")
+            password = request.form.get("password")
+
+            # --- Update users table ---
+            query = "UPDATE users SET full_name = %s, role = %s, status = %s"
+            values = [full_name, role, status]
+
+            if password:  # optional password update
+                query += ", password = %s"
+                values.append(hash_password(password))
+
+            query += " WHERE user_id = %s"
+            values.append(user_id)
+
+            cursor.execute(query, tuple(values))
+
+            # --- Upsert role-specific table (user_id is unique) ---
+            if role == "Veterinarian":
                 cursor.execute(
-                    "INSERT INTO veterinarians (user_id, specialization, phone, clinic_address) VALUES (%s, %s, %s, %s)",
+                    """
+                    INSERT INTO veterinarians (user_id, specialization, phone, clinic_address) VALUES (%s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE specialization = VALUES(specialization), phone = VALUES(phone), clinic_address = VALUES(clinic_address)
+                    """,
                     (user_id, specialization, phone, address)
                 )
-        elif role == "Pet Owner":
-            # Check if entry exists
-            cursor.execute("SELECT * FROM owners WHERE user_id = %s", (user_id,))
-            owner = cursor.fetchone()
-            if owner:
-                # Update existing
-                cursor.execute(
-                    "UPDATE owners SET phone = %s, address = %s WHERE user_id = %s",
-                    (phone, address, user_id)
-                )
-            else:
-                # Insert new
+            elif role == "Pet Owner":
                 cursor.execute(
-                    "INSERT INTO owners (user_id, phone, address) VALUES (%s, %s, %s)",
+                    """
+                    INSERT INTO owners (user_id, phone, address) VALUES (%s, %s, %s)
+                    ON DUPLICATE KEY UPDATE phone = VALUES(phone), address = VALUES(address)
+                    """,
                     (user_id, phone, address)
                 )
 
-        # Commit everything at once
-        conn.commit()
-        flash("User updated successfully", "success")
-
-    except mysql.connector.Error as e:
-        conn.rollback()
-        print("MySQL Error:", e)
-        flash("Something went wrong", "danger")
+            # Commit everything at once
+            conn.commit()
+            cache.delete_many(*USER_NAME_CACHE_KEYS)
+            if str(user_id) == str(session["user_id"]):
+                session.pop("owner_id", None)
+                session.pop("vet_id", None)
+            flash("User updated successfully", "success")
 
-    finally:
-        cursor.close()
-        conn.close()
+        except mysql.connector.Error as e:
+            conn.rollback()
+            app.logger.exception("MySQL error in manage_edit_users")
+            flash("Something went wrong", "danger")
 
     return redirect(url_for("manage_users"))
 
-@app.route("/manage_delete_user", methods=["DELETE"])
+@app.route("/manage_delete_user/<int:user_id>", methods=["DELETE"])
 @role_required("Admin")
-def manage_delete_users():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        data = request.get_json()
-        user_id = data.get("user_id")
-        # cursor.execute("DELETE FROM users WHERE user_id =%s", (user_id,))
-        cursor.execute(
-            "UPDATE users SET vchr_status ='D' WHERE user_id =%s", (user_id,)
-        )
-        conn.commit()
-        return jsonify({"success": True, "message": "User deleted successfully"})
-    except mysql.connector.Error as e:
-        conn.rollback()
-        return jsonify({"success": False, "message": "Something went wrong"}), 500
-    finally:
-        cursor.close()
-        conn.close()
+def manage_delete_users(user_id):
+    with db_cursor() as (conn, cursor):
+        try:
+            # cursor.execute("DELETE FROM users WHERE user_id =%s", (user_id,))
+            cursor.execute(
+                "UPDATE users SET vchr_status ='D' WHERE user_id =%s", (user_id,)
+            )
+            # FOUND_ROWS: an already-deleted user still matches, so only a missing id is a 404
+            if cursor.rowcount == 0:
+                return jsonify({"success": False, "message": "User not found"}), 404
+            conn.commit()
+            cache.delete(ADMIN_DASHBOARD_CACHE_KEY)
+            return jsonify({"success": True, "message": "User deleted successfully"})
+        except mysql.connector.Error as e:
+            conn.rollback()
+            return jsonify({"success": False, "message": "Something went wrong"}), 500
 
 
 # ----- List all pets -----
@@ -534,34 +773,27 @@ def manage_delete_users():
 # @app.route("/managepets")
 @role_required("Admin","Pet Owner")
 def manage_pets(pet_id):
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        user_id = session["user_id"]
-        query = """
-            SELECT pt.*, usr.full_name AS owner_name
-            FROM pets pt
-            LEFT JOIN owners owr ON pt.owner_id = owr.owner_id
-            LEFT JOIN users usr ON usr.user_id = owr.user_id
-        """
-        params = []
-        if session["role"] == "Pet Owner":
-            query += " WHERE owr.user_id = %s"
-            params.append(user_id)
-
-            if pet_id is not None:
-                query += " AND pt.pet_id = %s"
-                params.append(pet_id)
-                
-        elif pet_id is not None:
-            query += " WHERE pt.pet_id = %s"
-            params.append(pet_id)
-            
-        cursor.execute(query, tuple(params))
-        pets = cursor.fetchall()
-    finally:
-        cursor.close()
-        conn.close()
+    # The admin's unfiltered listing is the widest JOIN here; cache it briefly, pet writes drop it
+    cacheable = session["role"] == "Admin" and pet_id is None
+    pets = cache.get(ADMIN_PETS_CACHE_KEY) if cacheable else None
+    if pets is None:
+        # Pet Owners only see their own pets; a NULL parameter disables that filter
+        owner_user_id = session["user_id"] if session["role"] == "Pet Owner" else None
+        with db_cursor() as (conn, cursor):
+            cursor.execute(
+                """
+                SELECT pt.pet_id, pt.owner_id, pt.name, pt.breed, pt.age, pt.gender, pt.medical_history, pt.image,
+                       usr.full_name AS owner_name
+                FROM pets pt
+                LEFT JOIN owners owr ON pt.owner_id = owr.owner_id
+                LEFT JOIN users usr ON usr.user_id = owr.user_id
+                WHERE (%s IS NULL OR owr.user_id = %s) AND (%s IS NULL OR pt.pet_id = %s)
+                """,
+                (owner_user_id, owner_user_id, pet_id, pet_id),
+            )
+            pets = cursor.fetchall()
+        if cacheable:
+            cache.set(ADMIN_PETS_CACHE_KEY, pets, timeout=30)
     return render_template("dashboard/admin_dashboard/managepets.html", pets=pets)
 
 
@@ -569,60 +801,54 @@ def manage_pets(pet_id):
 @app.route("/manage_add_pet", methods=["POST"])
 @role_required("Admin", "Pet Owner")
 def manage_add_pet():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        # For Pet Owner role, get owner_id from session
-        if session["role"] == "Pet Owner":
-            owner_id = session["user_id"]
-            cursor.execute("SELECT owner_id FROM owners WHERE user_id = %s", (session["user_id"],))
-            owner_data = cursor.fetchone()
-            owner_id = owner_data["owner_id"] if owner_data else None
-        else:
-            owner_id = request.form["owner_id"]
-        name = request.form["name"]
-        breed = request.form["breed"]
-        age = request.form["age"]
-        gender = request.form["gender"]
-        medical_history = request.form.get("medical_history")
+    with db_cursor() as (conn, cursor):
+        try:
+            name = request.form["name"]
+            breed = request.form["breed"]
+            age = request.form["age"]
+            gender = request.form["gender"]
+            medical_history = request.form.get("medical_history")
         
-        # Handle file upload
-        file = request.files.get("image")
-        image_path = ""
-        if file and file.filename and allowed_file(file.filename):
-            # Check file size (5MB limit)
-            file.seek(0, 2)  # Seek to end
-            file_size = file.tell()
-            file.seek(0)  # Reset to beginning
-            if file_size > 5 * 1024 * 1024:
-                flash("File size must not exceed 5MB", "danger")
+            # Handle file upload
+            file = request.files.get("image")
+            image_path = ""
+            # Bodies over MAX_CONTENT_LENGTH (5MB) are rejected with 413 before the form is parsed
+            if file and file.filename and allowed_file(file.filename):
+                # Random prefix so two uploads with the same name never collide
+                filename = f"{secrets.token_hex(6)}_{secure_filename(file.filename)}"
+                dest = os.path.join(PETS_UPLOAD_FOLDER, filename)
+                move_upload(file, dest)
+                image_executor.submit(shrink_pet_image, dest)
+                # Store relative path for database
+                image_path = f"uploads/pets/{filename}"
+
+            values = (name, breed, age, gender, medical_history, image_path)
+            # Pet Owners resolve their owner_id inside the INSERT instead of a separate lookup
+            if session["role"] == "Pet Owner":
+                query = """
+                    INSERT INTO pets (owner_id, name, breed, age, gender, medical_history, image)
+                    SELECT owner_id, %s, %s, %s, %s, %s, %s FROM owners WHERE user_id = %s
+                """
+                values += (session["user_id"],)
+            else:
+                query = """
+                    INSERT INTO pets (owner_id, name, breed, age, gender, medical_history, image)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """
+                values = (request.form["owner_id"],) + values
+            cursor.execute(query, values)
+            # A Pet Owner without an owners row gets no pet from the INSERT ... SELECT
+            if cursor.rowcount == 0:
+                conn.rollback()
+                flash("Owner profile not found", "danger")
                 return redirect(url_for("manage_pets"))
-            
-            filename = secure_filename(file.filename)
-            # Create unique filename to avoid conflicts
-            import time
-            filename = f"{int(time.time())}_{filename}"
-            pets_folder = os.path.join(UPLOAD_FOLDER, 'pets')
-            os.makedirs(pets_folder, exist_ok=True)
-            file.save(os.path.join(pets_folder, filename))
-            # Store relative path for database
-            image_path = f"uploads/pets/{filename}"
-
-        query = """
-            INSERT INTO pets (owner_id, name, breed, age, gender, medical_history, image)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        values = (owner_id, name, breed, age, gender, medical_history, image_path)
-        cursor.execute(query, values)
-        conn.commit()
-        flash("Pet added successfully", "success")
-    except mysql.connector.Error as e:
-        conn.rollback()
-        print("MySQL Error:", e)
-        flash("Something went wrong", "danger")
-    finally:
-        cursor.close()
-        conn.close()
+            conn.commit()
+            cache.delete_many(ADMIN_PETS_CACHE_KEY, ADMIN_DASHBOARD_CACHE_KEY)
+            flash("Pet added successfully", "success")
+        except mysql.connector.Error as e:
+            conn.rollback()
+            app.logger.exception("MySQL error in manage_add_pet")
+            flash("Something went wrong", "danger")
 
     return redirect(url_for("manage_pets"))
 
@@ -631,68 +857,50 @@ def manage_add_pet():
 @app.route("/manage_edit_pet", methods=["POST"])
 @role_required("Admin", "Pet Owner")
 def manage_edit_pet():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        pet_id = request.form["pet_id"]
-        # For Pet Owner role, get owner_id from session
-        if session["role"] == "Pet Owner":
-            cursor.execute("SELECT owner_id FROM owners WHERE user_id = %s", (session["user_id"],))
-            owner_data = cursor.fetchone()
-            owner_id = owner_data["owner_id"] if owner_data else None
-        else:
-            owner_id = request.form["owner_id"]
-        name = request.form["name"]
-        breed = request.form["breed"]
-        age = request.form["age"]
-        gender = request.form["gender"]
-        medical_history = request.form.get("medical_history")
-
-        # Handle file upload
-        file = request.files.get("image")
-        image_path = None
-        if file and file.filename and allowed_file(file.filename):
-            # Check file size (5MB limit)
-            file.seek(0, 2)  # Seek to end
-            file_size = file.tell()
-            file.seek(0)  # Reset to beginning
-            if file_size > 5 * 1024 * 1024:
-                flash("File size must not exceed 5MB", "danger")
-                return redirect(url_for("manage_pets"))
-            
-            filename = secure_filename(file.filename)
-            # Create unique filename to avoid conflicts
-            import time
-            filename = f"{int(time.time())}_{filename}"
-            pets_folder = os.path.join(UPLOAD_FOLDER, 'pets')
-            os.makedirs(pets_folder, exist_ok=True)
-            file.save(os.path.join(pets_folder, filename))
-            image_path = f"uploads/pets/{filename}"
-
-        query = """
-            UPDATE pets
-            SET owner_id = %s, name = %s, breed = %s, age = %s, gender = %s,
-                medical_history = %s
-        """
-        values = [owner_id, name, breed, age, gender, medical_history]
-
-        if image_path:
-            query += ", image = %s"
-            values.append(image_path)
-
-        query += " WHERE pet_id = %s"
-        values.append(pet_id)
-
-        cursor.execute(query, tuple(values))
-        conn.commit()
-        flash("Pet updated successfully", "success")
-    except mysql.connector.Error as e:
-        conn.rollback()
-        print("MySQL Error:", e)
-        flash("Something went wrong", "danger")
-    finally:
-        cursor.close()
-        conn.close()
+    with db_cursor() as (conn, cursor):
+        try:
+            pet_id = request.form["pet_id"]
+            name = request.form["name"]
+            breed = request.form["breed"]
+            age = request.form["age"]
+            gender = request.form["gender"]
+            medical_history = request.form.get("medical_history")
+
+            # Handle file upload
+            file = request.files.get("image")
+            image_path = None
+            # Bodies over MAX_CONTENT_LENGTH (5MB) are rejected with 413 before the form is parsed
+            if file and file.filename and allowed_file(file.filename):
+                # Random prefix so two uploads with the same name never collide
+                filename = f"{secrets.token_hex(6)}_{secure_filename(file.filename)}"
+                dest = os.path.join(PETS_UPLOAD_FOLDER, filename)
+                move_upload(file, dest)
+                image_executor.submit(shrink_pet_image, dest)
+                image_path = f"uploads/pets/{filename}"
+
+            # Admins pass owner_id; for Pet Owners it is NULL and resolved from the session user.
+            # A NULL image keeps the current one.
+            if session["role"] == "Pet Owner":
+                owner_id, owner_user_id = None, session["user_id"]
+            else:
+                owner_id, owner_user_id = request.form["owner_id"], None
+            cursor.execute(
+                """
+                UPDATE pets
+                SET owner_id = COALESCE(%s, (SELECT owner_id FROM owners WHERE user_id = %s)),
+                    name = %s, breed = %s, age = %s, gender = %s, medical_history = %s,
+                    image = COALESCE(%s, image)
+                WHERE pet_id = %s
+                """,
+                (owner_id, owner_user_id, name, breed, age, gender, medical_history, image_path, pet_id),
+            )
+            conn.commit()
+            cache.delete_many(ADMIN_PETS_CACHE_KEY, ADMIN_DASHBOARD_CACHE_KEY)
+            flash("Pet updated successfully", "success")
+        except mysql.connector.Error as e:
+            conn.rollback()
+            app.logger.exception("MySQL error in manage_edit_pet")
+            flash("Something went wrong", "danger")
 
     return redirect(url_for("manage_pets"))
 
@@ -700,283 +908,251 @@ def manage_edit_pet():
 @app.route("/manage_delete_pet", methods=["DELETE"])
 @role_required("Admin")
 def manage_delete_pet():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        data = request.get_json()
-        pet_id = data.get("pet_id")
+    with db_cursor() as (conn, cursor):
+        try:
+            data = request.get_json()
+            pet_id = data.get("pet_id")
         
-        # Delete the pet record
-        cursor.execute(
-            "DELETE FROM pets WHERE pet_id = %s", (pet_id,)
-        )
-        conn.commit()
-        return jsonify({"success": True, "message": "Pet deleted successfully"})
-    except mysql.connector.Error as e:
-        conn.rollback()
-        return jsonify({"success": False, "message": "Something went wrong"}), 500
-    finally:
-        cursor.close()
-        conn.close()
+            # Delete the pet record
+            cursor.execute(
+                "DELETE FROM pets WHERE pet_id = %s", (pet_id,)
+            )
+            conn.commit()
+            cache.delete_many(ADMIN_PETS_CACHE_KEY, ADMIN_DASHBOARD_CACHE_KEY)
+            return jsonify({"success": True, "message": "Pet deleted successfully"})
+        except mysql.connector.Error as e:
+            conn.rollback()
+            return jsonify({"success": False, "message": "Something went wrong"}), 500
 
 
 @app.route("/profile", methods=["GET"])
 @role_required("Admin","Pet Owner","Veterinarian")
 def profile():
-    if "user_id" not in session:
-        return redirect(url_for("login"))
-    
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
+    with db_cursor() as (conn, cursor):
         user_id = session["user_id"]
         role = session["role"]
         
-        # Get user basic info
-        cursor.execute("SELECT user_id AS user_id, full_name AS full_name, email AS email, role AS role, status AS status, DATE_FORMAT(created_at, '%d %M %Y') AS created_at FROM users WHERE user_id = %s", (user_id,))
-        user = cursor.fetchone()
-        
-        # Get role-specific info
+        # User info and the role-specific row in one query; a missing role row reads as NULLs
         if role == "Pet Owner":
-            cursor.execute("SELECT phone, address FROM owners WHERE user_id = %s", (user_id,))
-            role_data = cursor.fetchone()
+            cursor.execute("""
+                SELECT u.user_id, u.full_name, u.email, u.role, u.status, DATE_FORMAT(u.created_at, '%d %M %Y') AS created_at,
+                       o.phone, o.address
+                FROM users u
+                LEFT JOIN owners o ON o.user_id = u.user_id
+                WHERE u.user_id = %s
+            """, (user_id,))
         elif role == "Veterinarian":
-            cursor.execute("SELECT phone, clinic_address as address, specialization FROM veterinarians WHERE user_id = %s", (user_id,))
-            role_data = cursor.fetchone()
+            cursor.execute("""
+                SELECT u.user_id, u.full_name, u.email, u.role, u.status, DATE_FORMAT(u.created_at, '%d %M %Y') AS created_at,
+                       v.phone, v.clinic_address AS address, v.specialization
+                FROM users u
+                LEFT JOIN veterinarians v ON v.user_id = u.user_id
+                WHERE u.user_id = %s
+            """, (user_id,))
         else:
-            role_data = {}
-        
-        # Merge data
-        profile = {**user, **(role_data or {})}
-        
-    finally:
-        cursor.close()
-        conn.close()
-    
+            cursor.execute("""
+                SELECT user_id, full_name, email, role, status, DATE_FORMAT(created_at, '%d %M %Y') AS created_at
+                FROM users
+                WHERE user_id = %s
+            """, (user_id,))
+        profile = cursor.fetchone()
+
     return render_template("dashboard/profile.html", objProfile=profile)
 
 @app.route("/update_profile", methods=["POST"])
 @role_required("Admin","Pet Owner","Veterinarian")
 def update_profile():
-    if "user_id" not in session:
-        return redirect(url_for("login"))
-    
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        user_id = session["user_id"]
-        role = session["role"]
-        
-        full_name = request.form["full_name"]
-        phone = request.form.get("phone")
-        address = request.form.get("address")
-        specialization = request.form.get("specialization")
-        password = request.form.get("password")
-        
-        # Update users table
-        query = "UPDATE users SET full_name = %s"
-        values = [full_name]
+    with db_cursor() as (conn, cursor):
+        try:
+            user_id = session["user_id"]
+            role = session["role"]
         
-        if password:
-            query += ", password = %s"
-            values.append(generate_password_hash(password))
+            full_name = request.form["full_name"]
+            phone = request.form.get("phone")
+            address = request.form.get("address")
+            specialization = request.form.get("specialization")
+            password = request.form.get("password")
         
-        query += " WHERE user_id = %s"
-        values.append(user_id)
-        cursor.execute(query, values)
+            # Update users table; a NULL password keeps the current hash
+            cursor.execute(
+                "UPDATE users SET full_name = %s, password = COALESCE(%s, password) WHERE user_id = %s",
+                (full_name, hash_password(password) if password else None, user_id),
+            )
         
-        # Update role-specific table
-        if role == "Pet Owner":
-            cursor.execute("SELECT * FROM owners WHERE user_id = %s", (user_id,))
-            if cursor.fetchone():
-                cursor.execute("UPDATE owners SET phone = %s, address = %s WHERE user_id = %s", (phone, address, user_id))
-            else:
-                cursor.execute("INSERT INTO owners (user_id, phone, address) VALUES (%s, %s, %s)", (user_id, phone, address))
-        elif role == "Veterinarian":
-            cursor.execute("SELECT * FROM veterinarians WHERE user_id = %s", (user_id,))
-            if cursor.fetchone():
-                cursor.execute("UPDATE veterinarians SET phone = %s, clinic_address = %s, specialization = %s WHERE user_id = %s", (phone, address, specialization, user_id))
-            else:
-                cursor.execute("INSERT INTO veterinarians (user_id, phone, clinic_address, specialization) VALUES (%s, %s, %s, %s)", (user_id, phone, address, specialization))
+            # Upsert role-specific table (user_id is unique)
+            if role == "Pet Owner":
+                cursor.execute(
+                    """
+                    INSERT INTO owners (user_id, phone, address) VALUES (%s, %s, %s)
+                    ON DUPLICATE KEY UPDATE phone = VALUES(phone), address = VALUES(address)
+                    """,
+                    (user_id, phone, address)
+                )
+            elif role == "Veterinarian":
+                cursor.execute(
+                    """
+                    INSERT INTO veterinarians (user_id, phone, clinic_address, specialization) VALUES (%s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE phone = VALUES(phone), clinic_address = VALUES(clinic_address), specialization = VALUES(specialization)
+                    """,
+                    (user_id, phone, address, specialization)
+                )
         
-        conn.commit()
-        flash("Profile updated successfully", "success")
+            conn.commit()
+            cache.delete_many(*USER_NAME_CACHE_KEYS)
+            flash("Profile updated successfully", "success")
         
-    except mysql.connector.Error as e:
-        conn.rollback()
-        flash("Something went wrong", "danger")
-    finally:
-        cursor.close()
-        conn.close()
+        except mysql.connector.Error as e:
+            conn.rollback()
+            flash("Something went wrong", "danger")
     
     return redirect(url_for("profile"))
 
 @app.route("/delete_account", methods=["DELETE"])
 @role_required("Admin","Pet Owner","Veterinarian")
 def delete_account():
-    if "user_id" not in session:
-        return jsonify({"success": False, "message": "Not logged in"}), 401
-    
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        user_id = session["user_id"]
-        cursor.execute("UPDATE users SET vchr_status = 'D' WHERE user_id = %s", (user_id,))
-        conn.commit()
-        session.clear()
-        return jsonify({"success": True, "message": "Account deleted successfully"})
-    except mysql.connector.Error as e:
-        conn.rollback()
-        return jsonify({"success": False, "message": "Something went wrong"}), 500
-    finally:
-        cursor.close()
-        conn.close()
+    with db_cursor() as (conn, cursor):
+        try:
+            user_id = session["user_id"]
+            cursor.execute("UPDATE users SET vchr_status = 'D' WHERE user_id = %s", (user_id,))
+            conn.commit()
+            cache.delete(ADMIN_DASHBOARD_CACHE_KEY)
+            session.clear()
+            return jsonify({"success": True, "message": "Account deleted successfully"})
+        except mysql.connector.Error as e:
+            conn.rollback()
+            return jsonify({"success": False, "message": "Something went wrong"}), 500
 
 @app.route("/book_appointment", methods=["GET", "POST"])
 @role_required("Pet Owner")
 def book_appointment():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    pets = []
-    try:
-        # Get owner's pets
-        cursor.execute("SELECT owner_id FROM owners WHERE user_id = %s", (session["user_id"],))
-        owner_data = cursor.fetchone()
-        if owner_data:
-            cursor.execute("SELECT * FROM pets WHERE owner_id = %s", (owner_data["owner_id"],))
-            pets = cursor.fetchall()
-            
-    finally:
-        cursor.close()
-        conn.close()
     if request.method == "GET":
+        pets = []
+        with db_cursor() as (conn, cursor):
+            # Get owner's pets
+            owner_id = current_owner_id(cursor)
+            if owner_id:
+                cursor.execute("SELECT pet_id, name, breed FROM pets WHERE owner_id = %s", (owner_id,))
+                pets = cursor.fetchall()
         return render_template("appointments/book.html", pets=pets)
     
     # POST - Book appointment
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        pet_id = request.form["pet_id"]
-        vet_id = request.form["vet_id"]
-        appointment_date = request.form["appointment_date"]
-        appointment_time = request.form["appointment_time"]
-        
-        # Get owner_id
-        cursor.execute("SELECT owner_id FROM owners WHERE user_id = %s", (session["user_id"],))
-        owner_data = cursor.fetchone()
-        
-        # Combine date and time
-        appointment_datetime = f"{appointment_date} {appointment_time}"
-        
-        # Check for conflicts (30-minute slots)
-        cursor.execute("""
-            SELECT * FROM appointments 
-            WHERE vet_id = %s AND appointment_date BETWEEN 
-            DATE_SUB(%s, INTERVAL 30 MINUTE) AND DATE_ADD(%s, INTERVAL 30 MINUTE)
-            AND status != 'Cancelled'
-        """, (vet_id, appointment_datetime, appointment_datetime))
-        
-        if cursor.fetchone():
-            flash("Time slot not available. Please choose another time.", "danger")
-            # Get vet name for display
-            cursor.execute("SELECT u.full_name FROM users u JOIN veterinarians v ON u.user_id = v.user_id WHERE v.vet_id = %s", (vet_id,))
-            vet_data = cursor.fetchone()
-            vet_name = vet_data["full_name"] if vet_data else ""
-            return render_template("appointments/book.html", pets=pets, pet_id=pet_id, vet_id=vet_id, vet_name=vet_name, appointment_date=appointment_date, appointment_time=appointment_time)
+    slot_taken = False
+    with db_cursor() as (conn, cursor):
+        try:
+            pet_id = request.form["pet_id"]
+            vet_id = request.form["vet_id"]
+            appointment_date = request.form["appointment_date"]
+            appointment_time = request.form["appointment_time"]
         
-        # Book appointment
-        cursor.execute("""
-            INSERT INTO appointments (pet_id, owner_id, vet_id, appointment_date)
-            VALUES (%s, %s, %s, %s)
-        """, (pet_id, owner_data["owner_id"], vet_id, appointment_datetime))
+            # Combine date and time
+            appointment_datetime = f"{appointment_date} {appointment_time}"
         
-        conn.commit()
-        flash("Appointment booked successfully!", "success")
+            # READ COMMITTED: the NOT EXISTS probe below is a consistent read that takes no gap
+            # locks, so concurrent bookings cannot deadlock; uk_appt_vet_slot rejects an exact
+            # double booking that slips between two concurrent probes
+            conn.start_transaction(isolation_level="READ COMMITTED")
+            try:
+                # Book unless the vet already has an appointment within 30 minutes of the slot
+                cursor.execute("""
+                    INSERT INTO appointments (pet_id, owner_id, vet_id, appointment_date)
+                    SELECT %s, owner_id, %s, %s FROM owners
+                    WHERE user_id = %s AND NOT EXISTS (
+                        SELECT 1 FROM appointments
+                        WHERE vet_id = %s AND appointment_date BETWEEN
+                        DATE_SUB(%s, INTERVAL 30 MINUTE) AND DATE_ADD(%s, INTERVAL 30 MINUTE)
+                        AND status != 'Cancelled'
+                    )
+                """, (pet_id, vet_id, appointment_datetime, session["user_id"], vet_id, appointment_datetime, appointment_datetime))
+                slot_taken = cursor.rowcount == 0
+                conn.commit()
+                if not slot_taken:
+                    cache.delete_many(ADMIN_DASHBOARD_CACHE_KEY, ADMIN_APPOINTMENTS_CACHE_KEY)
+            except mysql.connector.IntegrityError as e:
+                if e.errno != errorcode.ER_DUP_ENTRY:
+                    raise
+                conn.rollback()
+                slot_taken = True
+
+            if slot_taken:
+                flash("Time slot not available. Please choose another time.", "danger")
+                # Only a rejected booking re-renders the form, so only then fetch the
+                # pet list and the vet name for display, together in one round-trip
+                pets, vet_rows = execute_multi(cursor, """
+                    SELECT pet_id, name, breed FROM pets
+                    WHERE owner_id = (SELECT owner_id FROM owners WHERE user_id = %s);
+                    SELECT u.full_name FROM users u JOIN veterinarians v ON u.user_id = v.user_id WHERE v.vet_id = %s
+                """, (session["user_id"], vet_id))
+                vet_name = vet_rows[0]["full_name"] if vet_rows else ""
+            else:
+                flash("Appointment booked successfully!", "success")
         
-    except mysql.connector.Error as e:
-        print(e)
-        conn.rollback()
-        flash("Something went wrong", "danger")
-    finally:
-        cursor.close()
-        conn.close()
-    
+        except mysql.connector.Error as e:
+            app.logger.exception("MySQL error in book_appointment")
+            conn.rollback()
+            slot_taken = False
+            flash("Something went wrong", "danger")
+
+    # The form is re-rendered after the connection has gone back to the pool
+    if slot_taken:
+        return render_template("appointments/book.html", pets=pets, pet_id=pet_id, vet_id=vet_id, vet_name=vet_name, appointment_date=appointment_date, appointment_time=appointment_time)
     return redirect(url_for("view_appointments"))
 
+# Template and query per role, chosen with one lookup; the Veterinarian and Pet Owner
+# queries are scoped by the session's user_id. appointment_id breaks date ties so pages
+# never overlap.
+APPOINTMENT_LISTS = {
+    # Admin sees all appointments; idx_appt_date returns them already in date order
+    "Admin": ("appointments/admin_list.html", """
+        SELECT a.appointment_id, a.appointment_date, a.status,
+               p.name as pet_name, u.full_name as owner_name, v_user.full_name as vet_name
+        FROM appointments a
+        JOIN pets p ON a.pet_id = p.pet_id
+        JOIN owners o ON a.owner_id = o.owner_id
+        JOIN users u ON o.user_id = u.user_id
+        JOIN veterinarians v ON a.vet_id = v.vet_id
+        JOIN users v_user ON v.user_id = v_user.user_id
+        ORDER BY a.appointment_date DESC, a.appointment_id DESC
+    """),
+    "Veterinarian": ("appointments/calender.html", """
+        SELECT a.appointment_id, a.pet_id, a.appointment_date, a.status,
+               p.name as pet_name, u.full_name as owner_name
+        FROM appointments a
+        JOIN veterinarians v ON a.vet_id = v.vet_id
+        JOIN pets p ON a.pet_id = p.pet_id
+        JOIN owners o ON a.owner_id = o.owner_id
+        JOIN users u ON o.user_id = u.user_id
+        WHERE v.user_id = %s
+        ORDER BY a.appointment_date DESC, a.appointment_id DESC
+    """),
+    "Pet Owner": ("appointments/list.html", """
+        SELECT a.appointment_id, a.appointment_date, a.status,
+               p.name as pet_name, u.full_name as vet_name, v.specialization
+        FROM appointments a
+        JOIN owners o ON a.owner_id = o.owner_id
+        JOIN pets p ON a.pet_id = p.pet_id
+        JOIN veterinarians v ON a.vet_id = v.vet_id
+        JOIN users u ON v.user_id = u.user_id
+        WHERE o.user_id = %s
+        ORDER BY a.appointment_date DESC, a.appointment_id DESC
+    """),
+}
+
 @app.route("/appointments")
 @role_required("Admin", "Veterinarian", "Pet Owner")
 def view_appointments():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        if session["role"] == "Admin":
-            # Admin sees all appointments
-            cursor.execute("""
-                SELECT a.*, p.name as pet_name, u.full_name as owner_name, v_user.full_name as vet_name
-                FROM appointments a
-                JOIN pets p ON a.pet_id = p.pet_id
-                JOIN owners o ON a.owner_id = o.owner_id
-                JOIN users u ON o.user_id = u.user_id
-                JOIN veterinarians v ON a.vet_id = v.vet_id
-                JOIN users v_user ON v.user_id = v_user.user_id
-                ORDER BY a.appointment_date DESC
-            """)
-            appointments = cursor.fetchall()
-        elif session["role"] == "Veterinarian":
-            # Get vet_id
-            cursor.execute("SELECT vet_id FROM veterinarians WHERE user_id = %s", (session["user_id"],))
-            vet_data = cursor.fetchone()
-            
-            if vet_data:
-                cursor.execute("""
-                    SELECT a.*, p.name as pet_name, u.full_name as owner_name
-                    FROM appointments a
-                    JOIN pets p ON a.pet_id = p.pet_id
-                    JOIN owners o ON a.owner_id = o.owner_id
-                    JOIN users u ON o.user_id = u.user_id
-                    WHERE a.vet_id = %s
-                    ORDER BY a.appointment_date DESC
-                """, (vet_data["vet_id"],))
-                appointments = cursor.fetchall()
-            else:
-                appointments = []
-        else:  # Pet Owner
-            # Get owner_id
-            cursor.execute("SELECT owner_id FROM owners WHERE user_id = %s", (session["user_id"],))
-            owner_data = cursor.fetchone()
-            
-            if owner_data:
-                cursor.execute("""
-                    SELECT a.*, p.name as pet_name, u.full_name as vet_name, v.specialization
-                    FROM appointments a
-                    JOIN pets p ON a.pet_id = p.pet_id
-                    JOIN veterinarians v ON a.vet_id = v.vet_id
-                    JOIN users u ON v.user_id = u.user_id
-                    WHERE a.owner_id = %s
-                    ORDER BY a.appointment_date DESC
-                """, (owner_data["owner_id"],))
-                appointments = cursor.fetchall()
-            else:
-                appointments = []
-            
-    finally:
-        cursor.close()
-        conn.close()
-    
-    if session["role"] == "Admin":
-        template = "appointments/admin_list.html"
-    elif session["role"] == "Veterinarian":
-        template = "appointments/calender.html"
-    else:
-        template = "appointments/list.html"
-    return render_template(template, appointments=appointments)
+    template, sql = APPOINTMENT_LISTS[session["role"]]
+    params = () if session["role"] == "Admin" else (session["user_id"],)
+    # Paged like the medical lists. Only the admin list is shared between users, so only it
+    # is cached, briefly; appointment writes drop the key
+    key = ADMIN_APPOINTMENTS_CACHE_KEY if session["role"] == "Admin" else None
+    page, size = page_args()
+    appointments, has_next = paged_rows(key, sql, params, timeout=15)
+    return render_template(template, appointments=appointments, page=page, size=size, has_next=has_next)
 
 @app.route("/pet_medical/<int:pet_id>")
 @role_required("Veterinarian")
 def pet_medical(pet_id):
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
+    with db_cursor() as (conn, cursor):
         # Get pet info
         cursor.execute("SELECT * FROM pets WHERE pet_id = %s", (pet_id,))
         pet = cursor.fetchone()
@@ -989,300 +1165,269 @@ def pet_medical(pet_id):
         cursor.execute("SELECT * FROM medications WHERE pet_id = %s ORDER BY start_date DESC", (pet_id,))
         medications = cursor.fetchall()
         
-    finally:
-        cursor.close()
-        conn.close()
     
     return render_template("medical/pet_medical.html", pet=pet, vaccinations=vaccinations, medications=medications)
 
 @app.route("/add_vaccination", methods=["POST"])
 @role_required("Veterinarian")
 def add_vaccination():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        # Get vet_id
-        cursor.execute("SELECT vet_id FROM veterinarians WHERE user_id = %s", (session["user_id"],))
-        vet_data = cursor.fetchone()
-        
-        pet_id = request.form["pet_id"]
-        vaccine_name = request.form["vaccine_name"]
-        date_given = request.form["date_given"]
-        next_due_date = request.form.get("next_due_date") or None
-        notes = request.form.get("notes")
-        
-        cursor.execute("""
-            INSERT INTO vaccinations (pet_id, vet_id, vaccine_name, date_given, next_due_date, notes)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (pet_id, vet_data["vet_id"], vaccine_name, date_given, next_due_date, notes))
+    with db_cursor() as (conn, cursor):
+        try:
+            pet_id = request.form["pet_id"]
+            vaccine_name = request.form["vaccine_name"]
+            date_given = request.form["date_given"]
+            next_due_date = request.form.get("next_due_date") or None
+            notes = request.form.get("notes")
         
-        # Auto-complete today's appointments for this pet and vet
-        cursor.execute("""
-            UPDATE appointments SET status = 'Completed' 
-            WHERE pet_id = %s AND vet_id = %s AND DATE(appointment_date) = CURDATE() 
-            AND status != 'Cancelled'
-        """, (pet_id, vet_data["vet_id"]))
+            # Record it and auto-complete today's appointments for this pet and vet in one round-trip;
+            # vet_id is resolved from the session user inside both statements
+            inserted, _ = execute_multi(cursor, """
+                INSERT INTO vaccinations (pet_id, vet_id, vaccine_name, date_given, next_due_date, notes)
+                SELECT %s, vet_id, %s, %s, %s, %s FROM veterinarians WHERE user_id = %s;
+                UPDATE appointments SET status = 'Completed'
+                WHERE pet_id = %s AND vet_id = (SELECT vet_id FROM veterinarians WHERE user_id = %s)
+                AND appointment_date >= CURDATE() AND appointment_date < CURDATE() + INTERVAL 1 DAY
+                AND status != 'Cancelled'
+            """, (pet_id, vaccine_name, date_given, next_due_date, notes, session["user_id"], pet_id, session["user_id"]))
         
-        conn.commit()
-        flash("Vaccination record added successfully!", "success")
+            # No veterinarians row for this user means the INSERT ... SELECT added nothing
+            if not inserted:
+                conn.rollback()
+                flash("Veterinarian profile not found", "danger")
+                return redirect(url_for("pet_medical", pet_id=pet_id))
+            conn.commit()
+            cache.delete_many(
+                ALL_VACCINATIONS_CACHE_KEY, VET_VACCINATIONS_CACHE_KEY.format(current_vet_id(cursor)),
+                ADMIN_DASHBOARD_CACHE_KEY, ADMIN_APPOINTMENTS_CACHE_KEY,
+            )
+            flash("Vaccination record added successfully!", "success")
         
-    except mysql.connector.Error as e:
-        conn.rollback()
-        flash("Something went wrong", "danger")
-    finally:
-        cursor.close()
-        conn.close()
+        except mysql.connector.Error as e:
+            conn.rollback()
+            flash("Something went wrong", "danger")
     
     return redirect(url_for("pet_medical", pet_id=pet_id))
 
 @app.route("/add_medication", methods=["POST"])
 @role_required("Veterinarian")
 def add_medication():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        # Get vet_id
-        cursor.execute("SELECT vet_id FROM veterinarians WHERE user_id = %s", (session["user_id"],))
-        vet_data = cursor.fetchone()
-        
-        pet_id = request.form["pet_id"]
-        medicine_name = request.form["medicine_name"]
-        dosage = request.form["dosage"]
-        start_date = request.form["start_date"]
-        end_date = request.form.get("end_date") or None
-        notes = request.form.get("notes")
-        
-        cursor.execute("""
-            INSERT INTO medications (pet_id, vet_id, medicine_name, dosage, start_date, end_date, notes)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """, (pet_id, vet_data["vet_id"], medicine_name, dosage, start_date, end_date, notes))
+    with db_cursor() as (conn, cursor):
+        try:
+            pet_id = request.form["pet_id"]
+            medicine_name = request.form["medicine_name"]
+            dosage = request.form["dosage"]
+            start_date = request.form["start_date"]
+            end_date = request.form.get("end_date") or None
+            notes = request.form.get("notes")
         
-        # Auto-complete today's appointments for this pet and vet
-        cursor.execute("""
-            UPDATE appointments SET status = 'Completed' 
-            WHERE pet_id = %s AND vet_id = %s AND DATE(appointment_date) = CURDATE() 
-            AND status != 'Cancelled'
-        """, (pet_id, vet_data["vet_id"]))
+            # Record it and auto-complete today's appointments for this pet and vet in one round-trip;
+            # vet_id is resolved from the session user inside both statements
+            inserted, _ = execute_multi(cursor, """
+                INSERT INTO medications (pet_id, vet_id, medicine_name, dosage, start_date, end_date, notes)
+                SELECT %s, vet_id, %s, %s, %s, %s, %s FROM veterinarians WHERE user_id = %s;
+                UPDATE appointments SET status = 'Completed'
+                WHERE pet_id = %s AND vet_id = (SELECT vet_id FROM veterinarians WHERE user_id = %s)
+                AND appointment_date >= CURDATE() AND appointment_date < CURDATE() + INTERVAL 1 DAY
+                AND status != 'Cancelled'
+            """, (pet_id, medicine_name, dosage, start_date, end_date, notes, session["user_id"], pet_id, session["user_id"]))
         
-        conn.commit()
-        flash("Medication record added successfully!", "success")
+            # No veterinarians row for this user means the INSERT ... SELECT added nothing
+            if not inserted:
+                conn.rollback()
+                flash("Veterinarian profile not found", "danger")
+                return redirect(url_for("pet_medical", pet_id=pet_id))
+            conn.commit()
+            cache.delete_many(
+                ALL_MEDICATIONS_CACHE_KEY, VET_MEDICATIONS_CACHE_KEY.format(current_vet_id(cursor)),
+                ADMIN_DASHBOARD_CACHE_KEY, ADMIN_APPOINTMENTS_CACHE_KEY,
+            )
+            flash("Medication record added successfully!", "success")
         
-    except mysql.connector.Error as e:
-        conn.rollback()
-        flash("Something went wrong", "danger")
-    finally:
-        cursor.close()
-        conn.close()
+        except mysql.connector.Error as e:
+            conn.rollback()
+            flash("Something went wrong", "danger")
     
     return redirect(url_for("pet_medical", pet_id=pet_id))
 
+ALL_VACCINATIONS_SQL = """
+    SELECT v.vaccination_id, v.vaccine_name, v.date_given, v.next_due_date, v.notes,
+           p.name as pet_name, u.full_name as vet_name, o.full_name as owner_name
+    FROM vaccinations v
+    JOIN pets p ON v.pet_id = p.pet_id
+    JOIN veterinarians vet ON v.vet_id = vet.vet_id
+    JOIN users u ON vet.user_id = u.user_id
+    JOIN owners o_tbl ON p.owner_id = o_tbl.owner_id
+    JOIN users o ON o_tbl.user_id = o.user_id
+    ORDER BY v.date_given DESC, v.vaccination_id DESC
+"""
+
+ALL_MEDICATIONS_SQL = """
+    SELECT m.medication_id, m.medicine_name, m.dosage, m.start_date, m.end_date, m.notes,
+           p.name as pet_name, u.full_name as vet_name, o.full_name as owner_name
+    FROM medications m
+    JOIN pets p ON m.pet_id = p.pet_id
+    JOIN veterinarians vet ON m.vet_id = vet.vet_id
+    JOIN users u ON vet.user_id = u.user_id
+    JOIN owners o_tbl ON p.owner_id = o_tbl.owner_id
+    JOIN users o ON o_tbl.user_id = o.user_id
+    ORDER BY m.start_date DESC, m.medication_id DESC
+"""
+
+# Field order follows the SELECT lists above
+VaccinationRow = namedtuple(
+    "VaccinationRow", "vaccination_id vaccine_name date_given next_due_date notes pet_name vet_name owner_name"
+)
+MedicationRow = namedtuple(
+    "MedicationRow", "medication_id medicine_name dosage start_date end_date notes pet_name vet_name owner_name"
+)
+
 @app.route("/admin_medical")
 @role_required("Admin")
 def admin_medical():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        # Get all vaccinations
-        cursor.execute("""
-            SELECT v.*, p.name as pet_name, u.full_name as vet_name, o.full_name as owner_name
-            FROM vaccinations v
-            JOIN pets p ON v.pet_id = p.pet_id
-            JOIN veterinarians vet ON v.vet_id = vet.vet_id
-            JOIN users u ON vet.user_id = u.user_id
-            JOIN owners o_tbl ON p.owner_id = o_tbl.owner_id
-            JOIN users o ON o_tbl.user_id = o.user_id
-            ORDER BY v.date_given DESC
-        """)
-        vaccinations = cursor.fetchall()
-        
-        # Get all medications
-        cursor.execute("""
-            SELECT m.*, p.name as pet_name, u.full_name as vet_name, o.full_name as owner_name
-            FROM medications m
-            JOIN pets p ON m.pet_id = p.pet_id
-            JOIN veterinarians vet ON m.vet_id = vet.vet_id
-            JOIN users u ON vet.user_id = u.user_id
-            JOIN owners o_tbl ON p.owner_id = o_tbl.owner_id
-            JOIN users o ON o_tbl.user_id = o.user_id
-            ORDER BY m.start_date DESC
-        """)
-        medications = cursor.fetchall()
-        
-    finally:
-        cursor.close()
-        conn.close()
-    
-    return render_template("medical/admin_medical.html", vaccinations=vaccinations, medications=medications)
+    page, size = page_args()
+    vaccinations = query_executor.submit(
+        paged_rows, ALL_VACCINATIONS_CACHE_KEY, ALL_VACCINATIONS_SQL, paging=(page, size), row_type=VaccinationRow
+    )
+    medications = query_executor.submit(
+        paged_rows, ALL_MEDICATIONS_CACHE_KEY, ALL_MEDICATIONS_SQL, paging=(page, size), row_type=MedicationRow
+    )
+    vaccinations, more_vaccinations = vaccinations.result()
+    medications, more_medications = medications.result()
+    return render_template(
+        "medical/admin_medical.html",
+        vaccinations=vaccinations,
+        medications=medications,
+        page=page,
+        size=size,
+        has_next=more_vaccinations or more_medications,
+    )
 
 @app.route("/vaccinations")
 @role_required("Admin", "Veterinarian")
 def view_vaccinations():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        if session["role"] == "Admin":
-            # Admin sees all vaccinations
-            cursor.execute("""
-                SELECT v.*, p.name as pet_name, u.full_name as vet_name, o.full_name as owner_name
+    if session["role"] == "Admin":
+        # Admin sees all vaccinations
+        vaccinations, has_next = paged_rows(ALL_VACCINATIONS_CACHE_KEY, ALL_VACCINATIONS_SQL, row_type=VaccinationRow)
+    else:  # Veterinarian
+        # Vet sees only their vaccinations
+        vet_id = current_vet_id()
+        # A Veterinarian account without a veterinarians row has nothing to list;
+        # skip the query rather than run one that cannot match
+        if not vet_id:
+            vaccinations, has_next = [], False
+        else:
+            vaccinations, has_next = paged_rows(VET_VACCINATIONS_CACHE_KEY.format(vet_id), """
+                SELECT v.vaccination_id, v.vaccine_name, v.date_given, v.next_due_date, v.notes,
+                       p.name as pet_name, o.full_name as owner_name
                 FROM vaccinations v
                 JOIN pets p ON v.pet_id = p.pet_id
-                JOIN veterinarians vet ON v.vet_id = vet.vet_id
-                JOIN users u ON vet.user_id = u.user_id
                 JOIN owners o_tbl ON p.owner_id = o_tbl.owner_id
                 JOIN users o ON o_tbl.user_id = o.user_id
-                ORDER BY v.date_given DESC
-            """)
-        else:  # Veterinarian
-            # Vet sees only their vaccinations
-            cursor.execute("SELECT vet_id FROM veterinarians WHERE user_id = %s", (session["user_id"],))
-            vet_data = cursor.fetchone()
-            
-            if vet_data:
-                cursor.execute("""
-                    SELECT v.*, p.name as pet_name, o.full_name as owner_name
-                    FROM vaccinations v
-                    JOIN pets p ON v.pet_id = p.pet_id
-                    JOIN owners o_tbl ON p.owner_id = o_tbl.owner_id
-                    JOIN users o ON o_tbl.user_id = o.user_id
-                    WHERE v.vet_id = %s
-                    ORDER BY v.date_given DESC
-                """, (vet_data["vet_id"],))
-            else:
-                cursor.execute("SELECT * FROM vaccinations WHERE 1=0")  # Empty result
-        
-        vaccinations = cursor.fetchall()
-        
-    finally:
-        cursor.close()
-        conn.close()
-    
-    return render_template("medical/vaccinations.html", vaccinations=vaccinations)
+                WHERE v.vet_id = %s
+                ORDER BY v.date_given DESC, v.vaccination_id DESC
+            """, (vet_id,))
+
+    page, size = page_args()
+    return render_template("medical/vaccinations.html", vaccinations=vaccinations, page=page, size=size, has_next=has_next)
 
 @app.route("/medications")
 @role_required("Admin", "Veterinarian")
 def view_medications():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        if session["role"] == "Admin":
-            # Admin sees all medications
-            cursor.execute("""
-                SELECT m.*, p.name as pet_name, u.full_name as vet_name, o.full_name as owner_name
+    if session["role"] == "Admin":
+        # Admin sees all medications
+        medications, has_next = paged_rows(ALL_MEDICATIONS_CACHE_KEY, ALL_MEDICATIONS_SQL, row_type=MedicationRow)
+    else:  # Veterinarian
+        # Vet sees only their medications
+        vet_id = current_vet_id()
+        # A Veterinarian account without a veterinarians row has nothing to list;
+        # skip the query rather than run one that cannot match
+        if not vet_id:
+            medications, has_next = [], False
+        else:
+            medications, has_next = paged_rows(VET_MEDICATIONS_CACHE_KEY.format(vet_id), """
+                SELECT m.medication_id, m.medicine_name, m.dosage, m.start_date, m.end_date, m.notes,
+                       p.name as pet_name, o.full_name as owner_name
                 FROM medications m
                 JOIN pets p ON m.pet_id = p.pet_id
-                JOIN veterinarians vet ON m.vet_id = vet.vet_id
-                JOIN users u ON vet.user_id = u.user_id
                 JOIN owners o_tbl ON p.owner_id = o_tbl.owner_id
                 JOIN users o ON o_tbl.user_id = o.user_id
-                ORDER BY m.start_date DESC
-            """)
-        else:  # Veterinarian
-            # Vet sees only their medications
-            cursor.execute("SELECT vet_id FROM veterinarians WHERE user_id = %s", (session["user_id"],))
-            vet_data = cursor.fetchone()
-            
-            if vet_data:
-                cursor.execute("""
-                    SELECT m.*, p.name as pet_name, o.full_name as owner_name
-                    FROM medications m
-                    JOIN pets p ON m.pet_id = p.pet_id
-                    JOIN owners o_tbl ON p.owner_id = o_tbl.owner_id
-                    JOIN users o ON o_tbl.user_id = o.user_id
-                    WHERE m.vet_id = %s
-                    ORDER BY m.start_date DESC
-                """, (vet_data["vet_id"],))
-            else:
-                cursor.execute("SELECT * FROM medications WHERE 1=0")  # Empty result
-        
-        medications = cursor.fetchall()
-        
-    finally:
-        cursor.close()
-        conn.close()
-    
-    return render_template("medical/medications.html", medications=medications)
+                WHERE m.vet_id = %s
+                ORDER BY m.start_date DESC, m.medication_id DESC
+            """, (vet_id,))
+
+    page, size = page_args()
+    return render_template("medical/medications.html", medications=medications, page=page, size=size, has_next=has_next)
 
 @app.route("/update_appointment_status", methods=["POST"])
 @role_required("Veterinarian")
 def update_appointment_status():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        data = request.get_json()
-        appointment_id = data.get("appointment_id")
-        status = data.get("status")
-        
-        # Verify appointment belongs to this vet
-        cursor.execute("SELECT vet_id FROM veterinarians WHERE user_id = %s", (session["user_id"],))
-        vet_data = cursor.fetchone()
-        
-        cursor.execute("SELECT * FROM appointments WHERE appointment_id = %s AND vet_id = %s", 
-                      (appointment_id, vet_data["vet_id"]))
-        appointment = cursor.fetchone()
-        
-        if not appointment:
-            return jsonify({"success": False, "message": "Appointment not found"}), 404
-        
-        cursor.execute("UPDATE appointments SET status = %s WHERE appointment_id = %s", 
-                      (status, appointment_id))
-        conn.commit()
+    data = request.get_json(silent=True) or {}
+    appointment_id = data.get("appointment_id")
+    status = data.get("status")
+    # Rejected before a connection is taken; MySQL would otherwise store '' for an unknown ENUM value
+    if not isinstance(status, str) or status not in APPOINTMENT_STATUSES:
+        return jsonify({"success": False, "message": "Invalid status"}), 400
+
+    with db_cursor() as (conn, cursor):
+        try:
+            # Only touches the appointment if it belongs to this vet; no matched row means not found
+            cursor.execute("""
+                UPDATE appointments SET status = %s
+                WHERE appointment_id = %s AND vet_id = (SELECT vet_id FROM veterinarians WHERE user_id = %s)
+            """, (status, appointment_id, session["user_id"]))
+            if cursor.rowcount == 0:
+                return jsonify({"success": False, "message": "Appointment not found"}), 404
+            conn.commit()
+            cache.delete(ADMIN_APPOINTMENTS_CACHE_KEY)
         
-        return jsonify({"success": True, "message": f"Appointment marked as {status}"})
+            return jsonify({"success": True, "message": f"Appointment marked as {status}"})
         
-    except mysql.connector.Error as e:
-        conn.rollback()
-        return jsonify({"success": False, "message": "Something went wrong"}), 500
-    finally:
-        cursor.close()
-        conn.close()
+        except mysql.connector.Error as e:
+            conn.rollback()
+            return jsonify({"success": False, "message": "Something went wrong"}), 500
 
 @app.route("/cancel_appointment", methods=["POST"])
 @role_required("Pet Owner")
 def cancel_appointment():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        data = request.get_json()
-        appointment_id = data.get("appointment_id")
-        
-        # Verify appointment belongs to this owner
-        cursor.execute("SELECT owner_id FROM owners WHERE user_id = %s", (session["user_id"],))
-        owner_data = cursor.fetchone()
-        
-        cursor.execute("SELECT * FROM appointments WHERE appointment_id = %s AND owner_id = %s", 
-                      (appointment_id, owner_data["owner_id"]))
-        appointment = cursor.fetchone()
-        
-        if not appointment:
-            return jsonify({"success": False, "message": "Appointment not found"}), 404
-        
-        if appointment["status"] != "Pending":
-            return jsonify({"success": False, "message": "Can only cancel pending appointments"}), 400
+    with db_cursor() as (conn, cursor):
+        try:
+            data = request.get_json()
+            appointment_id = data.get("appointment_id")
         
-        cursor.execute("UPDATE appointments SET status = 'Cancelled' WHERE appointment_id = %s", 
-                      (appointment_id,))
-        conn.commit()
+            # Ownership and the Pending rule are enforced by the UPDATE itself, so the check cannot race
+            cursor.execute("""
+                UPDATE appointments SET status = 'Cancelled'
+                WHERE appointment_id = %s AND status = 'Pending'
+                AND owner_id = (SELECT owner_id FROM owners WHERE user_id = %s)
+            """, (appointment_id, session["user_id"]))
+            if cursor.rowcount == 0:
+                # Rare path: work out which response applies
+                cursor.execute("""
+                    SELECT 1 FROM appointments
+                    WHERE appointment_id = %s AND owner_id = (SELECT owner_id FROM owners WHERE user_id = %s)
+                """, (appointment_id, session["user_id"]))
+                if cursor.fetchone() is None:
+                    return jsonify({"success": False, "message": "Appointment not found"}), 404
+                return jsonify({"success": False, "message": "Can only cancel pending appointments"}), 400
+            conn.commit()
+            cache.delete(ADMIN_APPOINTMENTS_CACHE_KEY)
         
-        return jsonify({"success": True, "message": "Appointment cancelled successfully"})
+            return jsonify({"success": True, "message": "Appointment cancelled successfully"})
         
-    except mysql.connector.Error as e:
-        conn.rollback()
-        return jsonify({"success": False, "message": "Something went wrong"}), 500
-    finally:
-        cursor.close()
-        conn.close()
+        except mysql.connector.Error as e:
+            conn.rollback()
+            return jsonify({"success": False, "message": "Something went wrong"}), 500
 
 @app.route("/upcoming_reminders")
 @role_required("Pet Owner")
 def upcoming_reminders():
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
-    try:
+    with db_cursor() as (conn, cursor):
         user_id = session["user_id"]
         
         # Get upcoming vaccinations (next due dates)
         cursor.execute("""
-            SELECT v.*, p.name as pet_name, p.breed, u.full_name as vet_name
+            SELECT v.vaccination_id, v.vaccine_name, v.next_due_date,
+                   p.name as pet_name, p.breed, u.full_name as vet_name
             FROM vaccinations v
             JOIN pets p ON v.pet_id = p.pet_id
             JOIN owners o ON p.owner_id = o.owner_id
@@ -1295,12 +1440,11 @@ def upcoming_reminders():
         
         # Get active medications (not yet ended)
         cursor.execute("""
-            SELECT m.*, p.name as pet_name, p.breed, u.full_name as vet_name
+            SELECT m.medication_id, m.medicine_name, m.dosage, m.end_date, m.notes,
+                   p.name as pet_name, p.breed
             FROM medications m
             JOIN pets p ON m.pet_id = p.pet_id
             JOIN owners o ON p.owner_id = o.owner_id
-            JOIN veterinarians vet ON m.vet_id = vet.vet_id
-            JOIN users u ON vet.user_id = u.user_id
             WHERE o.user_id = %s AND (m.end_date IS NULL OR m.end_date >= CURDATE())
             ORDER BY m.end_date ASC
         """, (user_id,))
@@ -1319,9 +1463,6 @@ def upcoming_reminders():
         """, (user_id,))
         upcoming_appointments = cursor.fetchall()
         
-    finally:
-        cursor.close()
-        conn.close()
     
     return render_template("notifications/upcoming.html", 
                          upcoming_vaccinations=upcoming_vaccinations,
@@ -1331,55 +1472,54 @@ def upcoming_reminders():
 @app.route("/autocomplete_users", methods=["GET"])
 def autocomplete_users():
     role = request.args.get("role", "")
-    query = request.args.get("q", "")
+    query = request.args.get("q", "").strip()
+    # Nothing typed yet (or a pasted blob) gets no suggestions, without touching the database
+    if not 2 <= len(query) <= 64:
+        return jsonify([])
+    # Prefix match so idx_users_autocomplete can range-scan; typed wildcards are matched literally
+    pattern = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+    # Rows come back already shaped as {id, label, ...} with only what the pickers show;
+    # for Pet Owner the id is owner_id, since that is what pets reference
+    if role == "Pet Owner":
+        sql = """
+            SELECT o.owner_id AS id, u.full_name AS label, u.email
+            FROM users u
+            JOIN owners o ON u.user_id = o.user_id
+            WHERE u.role = "Pet Owner" AND u.full_name LIKE %s AND u.vchr_status = 'A'
+            LIMIT 10
+        """
+        params = (pattern,)
+    elif role == "Veterinarian":
+        sql = """
+            SELECT v.vet_id AS id, u.full_name AS label, u.email, v.specialization
+            FROM users u
+            JOIN veterinarians v ON u.user_id = v.user_id
+            WHERE u.role = "Veterinarian" AND u.full_name LIKE %s AND u.vchr_status = 'A'
+            LIMIT 10
+        """
+        params = (pattern,)
+    else:
+        sql = """
+            SELECT user_id AS id, full_name AS label, email
+            FROM users 
+            WHERE role = %s AND full_name LIKE %s AND vchr_status = 'A'
+            LIMIT 10
+        """
+        params = (role, pattern)
 
-    conn = get_conn()
-    cursor = conn.cursor(dictionary=True)
     try:
-        # For Pet Owner role, we need to get owner_id from owners table
-        if role == "Pet Owner":
-            sql = """
-                SELECT u.user_id, u.full_name, u.email, o.owner_id
-                FROM users u
-                JOIN owners o ON u.user_id = o.user_id
-                WHERE u.role = "Pet Owner" AND u.full_name LIKE %s AND u.vchr_status = 'A'
-                LIMIT 10
-            """
-            cursor.execute(sql, (f"%{query}%",))
-            results = cursor.fetchall()
-            # Replace user_id with owner_id for pet ownership
-            for result in results:
-                result['user_id'] = result['owner_id']
-        elif role == "Veterinarian":
-            sql = """
-                SELECT u.user_id, u.full_name, u.email, v.specialization,v.vet_id
-                FROM users u
-                JOIN veterinarians v ON u.user_id = v.user_id
-                WHERE u.role = "Veterinarian" AND u.full_name LIKE %s AND u.vchr_status = 'A'
-                LIMIT 10
-            """
-            cursor.execute(sql, (f"%{query}%",))
-            results = cursor.fetchall()
-        else:
-            sql = """
-                SELECT user_id, full_name, email 
-                FROM users 
-                WHERE role = %s AND full_name LIKE %s AND vchr_status = 'A'
-                LIMIT 10
-            """
-            cursor.execute(sql, (role, f"%{query}%"))
-            results = cursor.fetchall()
+        # Each keystroke repeats the prefixes other users have just typed; a 30 second
+        # window keeps new or renamed users from lagging noticeably
+        results = cached_rows(AUTOCOMPLETE_CACHE_KEY.format(role, query.lower()), sql, params, timeout=30)
         return jsonify(results)
     except Exception as e:
         return jsonify([])
-    finally:
-        cursor.close()
-        conn.close()
 
 # ---------- MAIN ----------
 if __name__ == "__main__":
-    conn = get_conn()
-    cur = conn.cursor(dictionary=True)
+    # Flask's logger defaults to WARNING; show the bootstrap messages below
+    app.logger.setLevel(logging.INFO)
     objAdmin = {
         "full_name": "admin",
         "password": "test123",
@@ -1387,28 +1527,26 @@ if __name__ == "__main__":
         "role": "Admin",
         "status": "Active",
     }
-    cur.execute("SELECT * FROM users WHERE full_name = %s", (objAdmin["full_name"],))
-    user = cur.fetchone()
-    if not user:
+    with db_cursor() as (conn, cur):
+        # users.email is UNIQUE, so the insert itself is the existence check and two
+        # processes booting at once cannot both add the admin
         try:
-            print("inserting default admin")
-            hashedPassword = generate_password_hash(objAdmin["password"])
             cur.execute(
                 "INSERT INTO users (full_name, password, email, role) VALUES (%s, %s, %s, %s)",
                 (
                     objAdmin["full_name"],
-                    hashedPassword,
+                    hash_password(objAdmin["password"]),
                     objAdmin["email"],
                     objAdmin["role"],
                 ),
             )
             conn.commit()
+            app.logger.info("Inserted default admin")
+        except mysql.connector.IntegrityError as e:
+            if e.errno != errorcode.ER_DUP_ENTRY:
+                raise
+            app.logger.info("Default admin already present")
         except mysql.connector.Error as e:
             conn.rollback()
-            cur.close()
-            conn.close()
-    else:
-        print("default admin already added")
-    cur.close()
-    conn.close()
-    app.run(debug=True)
+    # Debugger and reloader only on request; production runs under gunicorn (see gunicorn.conf.py)
+    app.run(debug=os.getenv("FLASK_DEBUG") == "1", threaded=True)
@@ -0,0 +1,18 @@
+# Production server settings: gunicorn -c gunicorn.conf.py backend:app
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+
+# Every request thread can hold one pooled connection, and admin_medical's two list
+# queries each take another on backend.query_executor's threads, so each worker's pool
+# needs `threads` + 2 slots (mysql.connector caps a pool at 32).
+os.environ.setdefault("DB_POOL_SIZE", str(threads + 2))
+
+# Import the app once in the master and fork workers from it, so imported modules, the WhiteNoise
+# file index and the password hasher are shared copy-on-write. Nothing opens a socket at
+# import: the MySQL pool is built on first use and Redis clients connect lazily per process.
+preload_app = True
@@ -0,0 +1,3 @@
+-- Lets the vet dashboard's "today's appointments" range predicate use an index seek.
+USE petcare;
+CREATE INDEX idx_appt_vet_date ON appointments (vet_id, appointment_date);
@@ -0,0 +1,7 @@
+-- Lets the owner dashboard reminders walk owners -> pets -> medications/vaccinations
+-- as index range scans instead of scanning the medical tables.
+USE petcare;
+CREATE INDEX idx_owners_user ON owners (user_id, owner_id);
+CREATE INDEX idx_pets_owner ON pets (owner_id, pet_id);
+CREATE INDEX idx_med_pet_end ON medications (pet_id, end_date);
+CREATE INDEX idx_vac_pet_date ON vaccinations (pet_id, date_given);
@@ -0,0 +1,7 @@
+-- One owners/veterinarians row per user, which INSERT ... ON DUPLICATE KEY UPDATE relies on.
+-- Remove any duplicate role rows before applying.
+USE petcare;
+ALTER TABLE owners ADD UNIQUE KEY uk_owner_user (user_id);
+-- uk_owner_user covers every lookup idx_owners_user served (InnoDB appends the primary key)
+ALTER TABLE owners DROP INDEX idx_owners_user;
+ALTER TABLE veterinarians ADD UNIQUE KEY uk_vet_user (user_id);
@@ -0,0 +1,6 @@
+-- Adds status to the vet/date index so the booking conflict check is answered from the index alone.
+USE petcare;
+-- Single ALTER so the vet_id foreign key is never left without a supporting index
+ALTER TABLE appointments
+    ADD INDEX idx_appt_vet_date_status (vet_id, appointment_date, status),
+    DROP INDEX idx_appt_vet_date;
@@ -0,0 +1,6 @@
+-- One active appointment per vet and start time; book_appointment treats a duplicate key as a taken slot.
+-- Cancelled rows map to a NULL slot_key and never collide. Resolve existing double bookings before applying.
+USE petcare;
+ALTER TABLE appointments
+    ADD COLUMN slot_key DATETIME AS (IF(status = 'Cancelled', NULL, appointment_date)) STORED,
+    ADD UNIQUE KEY uk_appt_vet_slot (vet_id, slot_key);
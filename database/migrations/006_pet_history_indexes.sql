@@ -0,0 +1,6 @@
+-- Pet-scoped lookups on the vet's medical pages: the "complete today's appointments" update
+-- after a vaccination/medication, and pet_medical's medication history ordered by start_date.
+USE petcare;
+-- status is last because the update filters it with !=, which cannot narrow an index range
+CREATE INDEX idx_appt_pet_vet_date ON appointments (pet_id, vet_id, appointment_date, status);
+CREATE INDEX idx_med_pet_start ON medications (pet_id, start_date);
@@ -0,0 +1,5 @@
+-- autocomplete_users filters on role and vchr_status and then prefix-matches full_name,
+-- so the name range comes last. owners/veterinarians.user_id are already covered by
+-- uk_owner_user and uk_vet_user.
+USE petcare;
+CREATE INDEX idx_users_autocomplete ON users (role, vchr_status, full_name);
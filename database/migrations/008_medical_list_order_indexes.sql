@@ -0,0 +1,8 @@
+-- The paged medical lists read newest first: the admin lists by date alone, the vet lists
+-- within one vet_id. InnoDB scans these backwards for DESC, so LIMIT stops after one page
+-- instead of filesorting every row. The vet_id indexes also take over the foreign keys.
+USE petcare;
+CREATE INDEX idx_vac_date ON vaccinations (date_given);
+CREATE INDEX idx_vac_vet_date ON vaccinations (vet_id, date_given);
+CREATE INDEX idx_med_start ON medications (start_date);
+CREATE INDEX idx_med_vet_start ON medications (vet_id, start_date);
@@ -0,0 +1,4 @@
+-- The admin dashboard counts upcoming appointments across all vets. This lets that
+-- range be counted from an index instead of scanning every appointment.
+USE petcare;
+CREATE INDEX idx_appt_date ON appointments (appointment_date);
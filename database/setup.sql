@@ -9,14 +9,16 @@ CREATE TABLE users (
     role ENUM('Admin','Veterinarian','Pet Owner') NOT NULL,
     status ENUM('Active', 'Inactive') DEFAULT 'Active',
     vchr_status ENUM('A', 'D') DEFAULT 'A',  -- A - alive user D - Deleted user
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_users_autocomplete (role, vchr_status, full_name)
 );
 CREATE TABLE owners (
     owner_id INT AUTO_INCREMENT PRIMARY KEY,
     user_id INT,
     phone VARCHAR(20),
     address TEXT,
-    FOREIGN KEY (user_id) REFERENCES users(user_id)
+    FOREIGN KEY (user_id) REFERENCES users(user_id),
+    UNIQUE KEY uk_owner_user (user_id)
 );
 CREATE TABLE pets (
     pet_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -28,7 +30,8 @@ CREATE TABLE pets (
     medical_history TEXT,
     image text,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (owner_id) REFERENCES owners(owner_id)
+    FOREIGN KEY (owner_id) REFERENCES owners(owner_id),
+    INDEX idx_pets_owner (owner_id, pet_id)
 );
 CREATE TABLE veterinarians (
     vet_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -36,7 +39,8 @@ CREATE TABLE veterinarians (
     specialization VARCHAR(100),
     phone VARCHAR(20),
     clinic_address TEXT,
-    FOREIGN KEY (user_id) REFERENCES users(user_id)
+    FOREIGN KEY (user_id) REFERENCES users(user_id),
+    UNIQUE KEY uk_vet_user (user_id)
 );
 CREATE TABLE appointments (
     appointment_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -46,9 +50,15 @@ CREATE TABLE appointments (
     appointment_date DATETIME,
     status ENUM('Pending','Confirmed','Completed','Cancelled') DEFAULT 'Pending',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- NULL for cancelled rows so a cancelled slot can be booked again
+    slot_key DATETIME AS (IF(status = 'Cancelled', NULL, appointment_date)) STORED,
     FOREIGN KEY (pet_id) REFERENCES pets(pet_id),
     FOREIGN KEY (owner_id) REFERENCES owners(owner_id),
-    FOREIGN KEY (vet_id) REFERENCES users(user_id)
+    FOREIGN KEY (vet_id) REFERENCES users(user_id),
+    INDEX idx_appt_vet_date_status (vet_id, appointment_date, status),
+    INDEX idx_appt_date (appointment_date),
+    INDEX idx_appt_pet_vet_date (pet_id, vet_id, appointment_date, status),
+    UNIQUE KEY uk_appt_vet_slot (vet_id, slot_key)
 );
 CREATE TABLE vaccinations (
     vaccination_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -59,7 +69,10 @@ CREATE TABLE vaccinations (
     next_due_date DATE,
     notes TEXT,
     FOREIGN KEY (pet_id) REFERENCES pets(pet_id),
-    FOREIGN KEY (vet_id) REFERENCES veterinarians(vet_id)
+    FOREIGN KEY (vet_id) REFERENCES veterinarians(vet_id),
+    INDEX idx_vac_pet_date (pet_id, date_given),
+    INDEX idx_vac_date (date_given),
+    INDEX idx_vac_vet_date (vet_id, date_given)
 );
 CREATE TABLE medications (
     medication_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -71,7 +84,11 @@ CREATE TABLE medications (
     end_date DATE,
     notes TEXT,
     FOREIGN KEY (pet_id) REFERENCES pets(pet_id),
-    FOREIGN KEY (vet_id) REFERENCES veterinarians(vet_id)
+    FOREIGN KEY (vet_id) REFERENCES veterinarians(vet_id),
+    INDEX idx_med_pet_end (pet_id, end_date),
+    INDEX idx_med_pet_start (pet_id, start_date),
+    INDEX idx_med_start (start_date),
+    INDEX idx_med_vet_start (vet_id, start_date)
 );
 CREATE TABLE expenses (
     expense_id INT AUTO_INCREMENT PRIMARY KEY,